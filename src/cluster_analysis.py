@@ -1,31 +1,41 @@
 #!/usr/bin/env python3
 """
 GDELT Cluster Analysis - Assigns clusters and extracts keywords
-Reads enriched CSV file and performs clustering on embeddings.
+Reads enriched Parquet file and performs clustering on embeddings.
 """
 
 import pandas as pd
 import numpy as np
 import logging
+import faiss
 from pathlib import Path
-from sklearn.cluster import KMeans
+from sklearn.cluster import kmeans_plusplus
 from sklearn.feature_extraction.text import TfidfVectorizer
-from collections import Counter
-import re
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+STOPWORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
+    'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these',
+    'those', 'it', 'its', 'they', 'them', 'their', 'what', 'which',
+    'who', 'when', 'where', 'why', 'how', 'all', 'each', 'every',
+    'both', 'few', 'more', 'most', 'other', 'some', 'such', 'no',
+    'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'just'
+})
 
-def load_enriched_data(input_file='data/gdelt_brazil_data_enriched.csv'):
-    """Load enriched GDELT data from CSV file."""
+
+def load_enriched_data(input_file='data/gdelt_brazil_data_enriched.parquet'):
+    """Load enriched GDELT data from Parquet file."""
     input_path = Path(__file__).parent.parent / input_file
 
     if not input_path.exists():
         raise FileNotFoundError(f"Input file not found: {input_path}")
 
     logger.info(f"Loading enriched data from: {input_path.absolute()}")
-    df = pd.read_csv(input_path)
+    df = pd.read_parquet(input_path)
     logger.info(f"Loaded {len(df)} records with {len(df.columns)} columns")
 
     if 'x_2d' not in df.columns or 'y_2d' not in df.columns:
@@ -44,7 +54,7 @@ def extract_2d_coordinates(df):
     return coords_2d
 
 
-def perform_clustering(coords_2d, n_clusters=10, random_state=42):
+def perform_clustering(coords_2d, n_clusters=10, random_state=42, n_init=10):
     """
     Perform K-means clustering on 2D coordinates.
 
@@ -52,14 +62,41 @@ def perform_clustering(coords_2d, n_clusters=10, random_state=42):
         coords_2d: Numpy array of 2D coordinates
         n_clusters: Number of clusters to create
         random_state: Random seed for reproducibility
+        n_init: Number of k-means++ initializations; the run with the lowest
+            inertia over all points is kept
 
     Returns:
         Array of cluster labels
     """
     logger.info(f"Performing K-means clustering on 2D coordinates with {n_clusters} clusters...")
 
-    kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
-    cluster_labels = kmeans.fit_predict(coords_2d)
+    points = np.ascontiguousarray(coords_2d, dtype=np.float32)
+    rng = np.random.RandomState(random_state)
+
+    # faiss seeds its centroids uniformly at random, which converges to
+    # merged/split clusters far more often than k-means++ (what sklearn's
+    # KMeans used); seed every run with k-means++ centroids instead
+    # Above k * 256 points faiss trains each run on its own random subsample,
+    # so obj[-1] values are not comparable across runs; score every run by
+    # its inertia over all points instead
+    best_inertia = np.inf
+    cluster_labels = None
+    for run in range(n_init):
+        init_centroids, _ = kmeans_plusplus(points, n_clusters, random_state=rng)
+        candidate = faiss.Kmeans(
+            d=points.shape[1],
+            k=n_clusters,
+            niter=20,
+            seed=random_state + run,
+            verbose=False
+        )
+        candidate.train(points, init_centroids=np.ascontiguousarray(init_centroids, dtype=np.float32))
+
+        distances, labels = candidate.index.search(points, 1)
+        inertia = distances.sum()
+        if inertia < best_inertia:
+            best_inertia = inertia
+            cluster_labels = labels.ravel()
 
     logger.info(f"Clustering complete. Cluster distribution:")
     unique, counts = np.unique(cluster_labels, return_counts=True)
@@ -69,45 +106,12 @@ def perform_clustering(coords_2d, n_clusters=10, random_state=42):
     return cluster_labels
 
 
-def extract_keywords_from_text(text, n_keywords=3):
-    """
-    Extract keywords from text using simple word frequency.
-
-    Args:
-        text: Text to extract keywords from
-        n_keywords: Number of top keywords to return
-
-    Returns:
-        List of top keywords
-    """
-    if not isinstance(text, str) or not text.strip():
-        return []
-
-    text = text.lower()
-    text = re.sub(r'[^\w\s]', ' ', text)
-
-    stopwords = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
-        'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-        'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these',
-        'those', 'it', 'its', 'they', 'them', 'their', 'what', 'which',
-        'who', 'when', 'where', 'why', 'how', 'all', 'each', 'every',
-        'both', 'few', 'more', 'most', 'other', 'some', 'such', 'no',
-        'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'just'
-    }
-
-    words = [w for w in text.split() if len(w) > 2 and w not in stopwords]
-
-    word_counts = Counter(words)
-    top_keywords = [word for word, count in word_counts.most_common(n_keywords)]
-
-    return top_keywords
-
-
 def extract_cluster_keywords(df, cluster_col='cluster', n_keywords=3):
     """
-    Extract top keywords for each cluster.
+    Extract top keywords for each cluster using TF-IDF.
+
+    Titles are joined into one document per cluster, so the scores favour
+    words that are frequent within a cluster but rare across the others.
 
     Args:
         df: DataFrame with cluster assignments and url_title
@@ -119,23 +123,48 @@ def extract_cluster_keywords(df, cluster_col='cluster', n_keywords=3):
     """
     logger.info(f"Extracting top {n_keywords} keywords for each cluster...")
 
-    cluster_keywords = {}
+    titles = df['url_title'].dropna().astype(str)
+    groups = (
+        titles.groupby(df.loc[titles.index, cluster_col])
+        .agg(' '.join)
+        .reindex(np.sort(df[cluster_col].unique()), fill_value='')
+    )
 
-    for cluster_id in sorted(df[cluster_col].unique()):
-        cluster_data = df[df[cluster_col] == cluster_id]
+    cluster_keywords = {cluster_id: 'N/A' for cluster_id in groups.index}
 
-        all_text = ' '.join(
-            cluster_data['url_title']
-            .fillna('')
-            .astype(str)
-            .tolist()
-        )
+    vectorizer = TfidfVectorizer(
+        lowercase=True,
+        stop_words=list(STOPWORDS),
+        token_pattern=r"(?u)\b\w\w\w+\b",
+        sublinear_tf=True,
+        max_features=20000
+    )
+
+    try:
+        tfidf = vectorizer.fit_transform(groups.values).tocsr()
+    except ValueError:
+        logger.warning("No usable words found in titles")
+        tfidf = None
+
+    if tfidf is not None:
+        feature_names = vectorizer.get_feature_names_out()
+
+        for i, cluster_id in enumerate(groups.index):
+            start, end = tfidf.indptr[i], tfidf.indptr[i + 1]
+            scores = tfidf.data[start:end]
+            indices = tfidf.indices[start:end]
+
+            if scores.size == 0:
+                continue
 
-        keywords = extract_keywords_from_text(all_text, n_keywords=n_keywords)
+            k = min(n_keywords, scores.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
 
-        cluster_keywords[cluster_id] = ', '.join(keywords) if keywords else 'N/A'
+            cluster_keywords[cluster_id] = ', '.join(feature_names[indices[j]] for j in top)
 
-        logger.info(f"  Cluster {cluster_id}: {cluster_keywords[cluster_id]}")
+    for cluster_id, keywords in cluster_keywords.items():
+        logger.info(f"  Cluster {cluster_id}: {keywords}")
 
     df['cluster_keywords'] = df[cluster_col].map(cluster_keywords)
 
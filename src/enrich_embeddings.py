@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
 """
 GDELT Embedding Enricher - Adds sentence embeddings to URL titles
-Reads CSV file and adds embeddings using sentence-transformers.
+Reads CSV file, embeds titles using sentence-transformers and saves the
+2D-projected data as Parquet with the raw embeddings in a .npy file.
 """
 
 import pandas as pd
 import numpy as np
 import logging
+import onnxruntime
+import umap
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
-from sklearn.manifold import TSNE
+from sklearn.decomposition import PCA
 from sklearn.preprocessing import MinMaxScaler
 from typing import Optional
 
@@ -25,13 +28,31 @@ def load_data(input_file='data/gdelt_brazil_data.csv'):
         raise FileNotFoundError(f"Input file not found: {input_path}")
 
     logger.info(f"Loading data from: {input_path.absolute()}")
-    df = pd.read_csv(input_path)
+    # CAMEO codes keep their leading zeros ('010', '01'), so read them as text
+    df = pd.read_csv(input_path, dtype={'EventCode': str, 'EventBaseCode': str, 'EventRootCode': str})
     logger.info(f"Loaded {len(df)} records")
 
     return df
 
 
-def generate_embeddings(df, model_name='all-MiniLM-L6-v2', batch_size=32):
+def get_onnx_model_kwargs():
+    """
+    Pick the ONNX model file and execution provider for the current machine.
+
+    Returns:
+        Dict of model_kwargs for SentenceTransformer's ONNX backend: the
+        fp16-optimized (O4) graph when onnxruntime can run on CUDA, the
+        int8-quantized graph on CPU otherwise
+    """
+    # Ask onnxruntime rather than torch: the default onnxruntime wheel is
+    # CPU-only even on machines where torch can see a GPU
+    if 'CUDAExecutionProvider' in onnxruntime.get_available_providers():
+        return {'file_name': 'onnx/model_O4.onnx', 'provider': 'CUDAExecutionProvider'}
+
+    return {'file_name': 'onnx/model_qint8_avx512_vnni.onnx', 'provider': 'CPUExecutionProvider'}
+
+
+def generate_embeddings(df, model_name='all-MiniLM-L6-v2', batch_size=64):
     """
     Generate embeddings for URL titles using sentence-transformers.
 
@@ -41,22 +62,29 @@ def generate_embeddings(df, model_name='all-MiniLM-L6-v2', batch_size=32):
         batch_size: Batch size for encoding
 
     Returns:
-        DataFrame with added embedding columns
+        Tuple of (DataFrame with added 2D coordinates, float32 embedding matrix
+        with one row per DataFrame row). The input DataFrame is not modified.
     """
     if df.empty:
         logger.warning("Empty DataFrame provided")
-        return df
+        return df, np.empty((0, 0), dtype=np.float32)
 
     if 'url_title' not in df.columns:
         raise ValueError("DataFrame must contain 'url_title' column")
 
-    df = df.copy()
+    model_kwargs = get_onnx_model_kwargs()
 
-    logger.info(f"Loading model: {model_name}")
+    logger.info(f"Loading model: {model_name} (ONNX, {model_kwargs['provider']})")
     logger.info("Downloading model from HuggingFace (first run only)...")
 
     try:
-        model = SentenceTransformer(model_name, trust_remote_code=True, token=False)
+        model = SentenceTransformer(
+            model_name,
+            backend='onnx',
+            model_kwargs=model_kwargs,
+            trust_remote_code=True,
+            token=False
+        )
     except Exception as e:
         error_msg = str(e)
         if 'expired' in error_msg.lower() or '401' in error_msg:
@@ -66,7 +94,13 @@ def generate_embeddings(df, model_name='all-MiniLM-L6-v2', batch_size=32):
                 import os
                 os.environ.pop('HF_TOKEN', None)
                 os.environ.pop('HUGGING_FACE_HUB_TOKEN', None)
-                model = SentenceTransformer(model_name, use_auth_token=False, token=False)
+                model = SentenceTransformer(
+                    model_name,
+                    backend='onnx',
+                    model_kwargs=model_kwargs,
+                    use_auth_token=False,
+                    token=False
+                )
             except Exception as e3:
                 raise RuntimeError(
                     f"Could not load model '{model_name}'. "
@@ -82,53 +116,78 @@ def generate_embeddings(df, model_name='all-MiniLM-L6-v2', batch_size=32):
             ) from e
 
     titles_to_embed = df['url_title'].fillna('').astype(str).tolist()
-    valid_titles = [t for t in titles_to_embed if t.strip()]
+    valid_idx = np.array([i for i, t in enumerate(titles_to_embed) if t.strip()], dtype=np.intp)
+    valid_titles = [titles_to_embed[i] for i in valid_idx]
 
     logger.info(f"Generating embeddings for {len(valid_titles)} titles (batch_size={batch_size})...")
 
-    embeddings = model.encode(
-        titles_to_embed,
-        batch_size=batch_size,
-        show_progress_bar=True,
-        convert_to_numpy=True
+    # Rows without a title keep a zero vector instead of costing a forward pass
+    embeddings = np.zeros(
+        (len(titles_to_embed), model.get_sentence_embedding_dimension()),
+        dtype=np.float32
     )
 
-    logger.info(f"Generated embeddings with shape: {embeddings.shape}")
+    if valid_titles:
+        # Encode in length order so each batch pads to similar lengths, then
+        # scatter the results back to their original rows
+        order = np.argsort([len(t) for t in valid_titles], kind='stable')
 
-    for i in range(embeddings.shape[1]):
-        df[f'embedding_{i}'] = embeddings[:, i]
+        embeddings[valid_idx[order]] = model.encode(
+            [valid_titles[i] for i in order],
+            batch_size=batch_size,
+            show_progress_bar=True,
+            convert_to_numpy=True
+        )
 
-    logger.info(f"Added {embeddings.shape[1]} embedding columns to DataFrame")
+    logger.info(f"Generated embeddings with shape: {embeddings.shape}")
 
-    logger.info("Reducing embeddings to 2D using t-SNE...")
-    reducer = TSNE(
+    n_pca = min(50, embeddings.shape[0], embeddings.shape[1])
+    logger.info(f"Pre-reducing embeddings to {n_pca} dimensions using PCA...")
+    embeddings_pca = PCA(n_components=n_pca, random_state=42).fit_transform(embeddings)
+
+    logger.info("Reducing embeddings to 2D using UMAP...")
+    reducer = umap.UMAP(
         n_components=2,
         random_state=42,
-        perplexity=min(30, len(embeddings) - 1),
-        max_iter=1000
+        n_neighbors=min(15, len(embeddings) - 1),
+        min_dist=0.1
     )
-    coords_2d = reducer.fit_transform(embeddings)
+    coords_2d = reducer.fit_transform(embeddings_pca)
 
     scaler = MinMaxScaler(feature_range=(0, 1))
     coords_2d = scaler.fit_transform(coords_2d)
 
-    df['x_2d'] = coords_2d[:, 0]
-    df['y_2d'] = coords_2d[:, 1]
+    coords_df = pd.DataFrame(coords_2d, index=df.index, columns=['x_2d', 'y_2d'])
+    df = pd.concat([df, coords_df], axis=1)
 
     logger.info(f"Added 2D coordinates (x_2d, y_2d) to DataFrame")
 
-    return df
+    return df, embeddings
+
+
+def save_enriched_data(df, embeddings, output_file='data/gdelt_brazil_data_enriched.parquet'):
+    """
+    Save enriched DataFrame to Parquet and its embeddings to a .npy file.
 
+    Args:
+        df: Enriched DataFrame (without embedding columns)
+        embeddings: Embedding matrix aligned with the DataFrame rows
+        output_file: Parquet path; embeddings go next to it with a .npy suffix
 
-def save_enriched_data(df, output_file='data/gdelt_brazil_data_enriched.csv'):
-    """Save enriched DataFrame to CSV file."""
+    Returns:
+        Path to the Parquet file
+    """
     output_path = Path(__file__).parent.parent / output_file
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    embeddings_path = output_path.with_suffix('.npy')
 
-    df.to_csv(output_path, index=False)
+    df.to_parquet(output_path, index=False, compression='zstd')
+    np.save(embeddings_path, embeddings.astype(np.float32, copy=False))
 
     logger.info(f"Enriched data saved to: {output_path.absolute()}")
     logger.info(f"File size: {output_path.stat().st_size / 1024 / 1024:.2f} MB")
+    logger.info(f"Embeddings saved to: {embeddings_path.absolute()}")
+    logger.info(f"File size: {embeddings_path.stat().st_size / 1024 / 1024:.2f} MB")
 
     return output_path
 
@@ -142,9 +201,9 @@ def main():
 
     data = load_data()
 
-    enriched_data = generate_embeddings(data, model_name='all-MiniLM-L6-v2', batch_size=32)
+    enriched_data, embeddings = generate_embeddings(data, model_name='all-MiniLM-L6-v2', batch_size=64)
 
-    output_file = save_enriched_data(enriched_data)
+    output_file = save_enriched_data(enriched_data, embeddings)
 
     print()
     print("=" * 60)
@@ -152,6 +211,7 @@ def main():
     print(f"Enriched data saved to: {output_file}")
     print(f"Total events: {len(enriched_data)}")
     print(f"Total columns: {len(enriched_data.columns)}")
+    print(f"Embedding dimensions: {embeddings.shape[1]}")
     print("=" * 60)
 
 
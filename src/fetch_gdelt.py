@@ -6,22 +6,84 @@ Saves data to CSV file for visualization.
 """
 
 import pandas as pd
-import gdelt
+import numpy as np
 import requests
+import httpx
+import asyncio
+import csv
+import html
 import logging
-from datetime import datetime, timedelta
+import re
+import zipfile
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from bs4 import BeautifulSoup
 from typing import Optional
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from io import StringIO
+from diskcache import Cache
+from io import BytesIO
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
+logging.getLogger('httpx').setLevel(logging.WARNING)
 
 _shared_session = None
+_title_cache = None
+_CACHE_MISS = object()
+
+TITLE_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'titles'
+TITLE_CACHE_TTL = 30 * 24 * 3600
+FAILED_TITLE_CACHE_TTL = 24 * 3600
+
+# Titles live in <head>, which is virtually always within the first 64 KB
+TITLE_SCAN_BYTES = 65536
+_TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive'
+}
+
+# Ask servers for just the prefix we scan; servers that ignore Range still
+# only have TITLE_SCAN_BYTES read from the body
+TITLE_REQUEST_HEADERS = {
+    'Range': f'bytes=0-{TITLE_SCAN_BYTES - 1}'
+}
+
+GDELT_V2_BASE_URL = 'http://data.gdeltproject.org/gdeltv2/'
+GDELT_UPDATE_INTERVAL = timedelta(minutes=15)
+
+GDELT_EVENT_COLUMNS = [
+    'GLOBALEVENTID', 'SQLDATE', 'MonthYear', 'Year', 'FractionDate',
+    'Actor1Code', 'Actor1Name', 'Actor1CountryCode', 'Actor1KnownGroupCode',
+    'Actor1EthnicCode', 'Actor1Religion1Code', 'Actor1Religion2Code',
+    'Actor1Type1Code', 'Actor1Type2Code', 'Actor1Type3Code',
+    'Actor2Code', 'Actor2Name', 'Actor2CountryCode', 'Actor2KnownGroupCode',
+    'Actor2EthnicCode', 'Actor2Religion1Code', 'Actor2Religion2Code',
+    'Actor2Type1Code', 'Actor2Type2Code', 'Actor2Type3Code',
+    'IsRootEvent', 'EventCode', 'EventBaseCode', 'EventRootCode', 'QuadClass',
+    'GoldsteinScale', 'NumMentions', 'NumSources', 'NumArticles', 'AvgTone',
+    'Actor1Geo_Type', 'Actor1Geo_FullName', 'Actor1Geo_CountryCode',
+    'Actor1Geo_ADM1Code', 'Actor1Geo_ADM2Code', 'Actor1Geo_Lat',
+    'Actor1Geo_Long', 'Actor1Geo_FeatureID',
+    'Actor2Geo_Type', 'Actor2Geo_FullName', 'Actor2Geo_CountryCode',
+    'Actor2Geo_ADM1Code', 'Actor2Geo_ADM2Code', 'Actor2Geo_Lat',
+    'Actor2Geo_Long', 'Actor2Geo_FeatureID',
+    'ActionGeo_Type', 'ActionGeo_FullName', 'ActionGeo_CountryCode',
+    'ActionGeo_ADM1Code', 'ActionGeo_ADM2Code', 'ActionGeo_Lat',
+    'ActionGeo_Long', 'ActionGeo_FeatureID',
+    'DATEADDED', 'SOURCEURL'
+]
+
+# Keep CAMEO codes as strings so leading zeros ('011') survive parsing
+GDELT_EVENT_DTYPES = {
+    'Actor1Code': str,
+    'EventCode': str,
+    'EventBaseCode': str,
+    'EventRootCode': str
+}
 
 DEMOCRACY_CATEGORIES = {
     'Political Repression & Restrictions': [
@@ -64,6 +126,14 @@ for category, codes in DEMOCRACY_CATEGORIES.items():
         DEMOCRACY_EVENT_CODES.add(code)
         CODE_TO_CATEGORY[code] = category
 
+# CAMEO codes compared as integers, so '011' and 11 both match. Root codes
+# only go up to 20, so dropping leading zeros cannot make two codes collide.
+_CATEGORY_NAMES = list(DEMOCRACY_CATEGORIES)
+_DEMOCRACY_CODES_INT = np.array(sorted({int(code) for code in DEMOCRACY_EVENT_CODES}), dtype=np.int32)
+_CATEGORY_LOOKUP = np.full(_DEMOCRACY_CODES_INT.max() + 1, -1, dtype=np.int8)
+for code, category in CODE_TO_CATEGORY.items():
+    _CATEGORY_LOOKUP[int(code)] = _CATEGORY_NAMES.index(category)
+
 
 def _get_shared_session():
     """Get or create a shared session with optimized settings."""
@@ -75,64 +145,83 @@ def _get_shared_session():
             backoff_factor=0,
             status_forcelist=[]
         )
+        # Only the export downloads use this session, all against one host:
+        # keep one connection per fetch_brazil_data worker
         adapter = HTTPAdapter(
             max_retries=retry,
-            pool_connections=20,
-            pool_maxsize=50
+            pool_maxsize=16
         )
         _shared_session.mount('http://', adapter)
         _shared_session.mount('https://', adapter)
-        _shared_session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        _shared_session.headers.update(HTTP_HEADERS)
     return _shared_session
 
 
-def get_page_title(url: str, timeout: int = 5, session: Optional[requests.Session] = None) -> Optional[str]:
+def _get_title_cache():
+    """Get or open the on-disk cache of page titles keyed by URL."""
+    global _title_cache
+    if _title_cache is None:
+        _title_cache = Cache(str(TITLE_CACHE_DIR))
+    return _title_cache
+
+
+def _cache_title(url: str, title: Optional[str]):
+    """Store a fetched title; failed fetches expire sooner so they get retried."""
+    expire = TITLE_CACHE_TTL if title else FAILED_TITLE_CACHE_TTL
+    _get_title_cache().set(url, title, expire=expire)
+
+
+def parse_title(content: bytes, encoding: Optional[str] = None) -> Optional[str]:
     """
-    Fetch the title of a web page from a given URL.
+    Extract the <title> text from the start of an HTML document.
 
     Args:
-        url: The URL to fetch the title from
-        timeout: Request timeout in seconds (default: 5)
-        session: Optional requests.Session to use (default: uses shared session)
+        content: Raw HTML bytes (only the first TITLE_SCAN_BYTES are needed)
+        encoding: Character encoding of the page (default: utf-8)
 
     Returns:
-        The page title if found, None otherwise
+        The unescaped, whitespace-normalized page title if found, None otherwise
     """
-    if not url or not isinstance(url, str):
-        return None
+    match = _TITLE_RE.search(content)
 
-    if session is None:
-        session = _get_shared_session()
+    if match is None:
+        return None
 
     try:
-        response = session.get(url, timeout=timeout, allow_redirects=True)
-        response.raise_for_status()
+        title = match.group(1).decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        title = match.group(1).decode('utf-8', errors='replace')
 
-        try:
-            soup = BeautifulSoup(response.content, 'lxml')
-        except:
-            soup = BeautifulSoup(response.content, 'html.parser')
+    title = ' '.join(html.unescape(title).split())
+    return title if title else None
 
-        title_tag = soup.find('title')
 
-        if title_tag and title_tag.string:
-            title = title_tag.string.strip()
-            return title if title else None
+def get_page_title(url: str, timeout: int = 5) -> Optional[str]:
+    """
+    Fetch the title of a web page from a given URL.
 
-        return None
+    Single-URL convenience wrapper around fetch_titles that also reads and
+    fills the on-disk title cache.
 
-    except requests.exceptions.Timeout:
-        logger.warning(f"Timeout fetching title from {url}")
-        return None
-    except requests.exceptions.RequestException as e:
-        logger.warning(f"Error fetching title from {url}: {e}")
-        return None
-    except Exception as e:
-        logger.warning(f"Unexpected error fetching title from {url}: {e}")
+    Args:
+        url: The URL to fetch the title from
+        timeout: Request timeout in seconds (default: 5)
+
+    Returns:
+        The page title if found, None otherwise
+    """
+    if not url or not isinstance(url, str):
         return None
 
+    cached = _get_title_cache().get(url, default=_CACHE_MISS)
+    if cached is not _CACHE_MISS:
+        return cached
+
+    title = asyncio.run(fetch_titles([url], timeout=timeout))[url]
+    _cache_title(url, title)
+
+    return title
+
 
 def filter_democracy_events(df):
     """
@@ -142,48 +231,146 @@ def filter_democracy_events(df):
         df: DataFrame with EventCode column
 
     Returns:
-        DataFrame filtered to democracy-related events with added category column
+        New DataFrame filtered to democracy-related events with added category
+        column (the input is not modified)
     """
     if df.empty:
         return df
 
-    df = df.copy()
-
-    df['EventCode'] = df['EventCode'].astype(str)
-
-    mask = df['EventCode'].isin(DEMOCRACY_EVENT_CODES)
-    df_filtered = df[mask]
+    codes = (
+        pd.to_numeric(df['EventCode'], errors='coerce')
+        .fillna(-1)
+        .astype(np.int32)
+        .to_numpy()
+    )
+    mask = np.isin(codes, _DEMOCRACY_CODES_INT)
 
-    df_filtered['democracy_category'] = df_filtered['EventCode'].map(CODE_TO_CATEGORY)
+    df_filtered = df[mask].assign(
+        democracy_category=pd.Categorical.from_codes(
+            _CATEGORY_LOOKUP[codes[mask]],
+            categories=_CATEGORY_NAMES
+        )
+    )
 
     logger.info(f"Filtered to {len(df_filtered)} democracy-related events from {len(df)} total events")
 
     return df_filtered
 
 
-def fetch_brazil_data(days=7):
-    """Fetch GDELT data for Brazil for the last N days and filter for democracy events."""
+def gdelt_export_timestamps(start, end):
+    """
+    List the GDELT 2.0 export file timestamps between two datetimes.
+
+    Args:
+        start: First datetime (UTC) to include
+        end: Datetime (UTC) to stop before
+
+    Returns:
+        List of 'YYYYMMDDHHMMSS' strings, one per 15-minute update
+    """
+    current = start.replace(minute=start.minute - start.minute % 15, second=0, microsecond=0)
+    timestamps = []
+
+    while current < end:
+        timestamps.append(current.strftime('%Y%m%d%H%M%S'))
+        current += GDELT_UPDATE_INTERVAL
+
+    return timestamps
+
+
+def fetch_brazil_events_file(timestamp, session=None, timeout=30):
+    """
+    Download one 15-minute GDELT 2.0 events export and keep only Brazil rows.
+
+    Args:
+        timestamp: Export timestamp as 'YYYYMMDDHHMMSS'
+        session: Optional requests.Session to use (default: uses shared session)
+        timeout: Request timeout in seconds (default: 30)
+
+    Returns:
+        Tuple of (DataFrame of events with Actor1Code starting with 'BR',
+        total number of events in the file)
+    """
+    if session is None:
+        session = _get_shared_session()
+
+    url = f"{GDELT_V2_BASE_URL}{timestamp}.export.CSV.zip"
+
+    try:
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+
+        with zipfile.ZipFile(BytesIO(response.content)) as archive:
+            with archive.open(archive.namelist()[0]) as export_file:
+                df = pd.read_csv(
+                    export_file,
+                    sep='\t',
+                    header=None,
+                    names=GDELT_EVENT_COLUMNS,
+                    dtype=GDELT_EVENT_DTYPES,
+                    quoting=csv.QUOTE_NONE,
+                    encoding_errors='replace'
+                )
+
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Error downloading {url}: {e}")
+        return pd.DataFrame(columns=GDELT_EVENT_COLUMNS), 0
+    except (zipfile.BadZipFile, IndexError, ValueError) as e:
+        # One unreadable 15-minute file (corrupt or empty archive, malformed
+        # rows) is skipped rather than aborting the whole fetch.
+        # pd.errors.ParserError is a ValueError subclass
+        logger.warning(f"Error reading {url}: {e}")
+        return pd.DataFrame(columns=GDELT_EVENT_COLUMNS), 0
+
+    mask = df['Actor1Code'].str.startswith('BR', na=False)
+
+    return df[mask], len(df)
+
+
+def fetch_brazil_data(days=7, max_workers=16):
+    """
+    Fetch GDELT data for Brazil for the last N days and filter for democracy events.
+
+    Each 15-minute export is downloaded and filtered to Brazil in its own
+    worker, so only the kept rows are ever held in memory together.
+
+    Args:
+        days: Number of days to look back
+        max_workers: Number of concurrent export downloads
+
+    Returns:
+        DataFrame of Brazil democracy-related events
+    """
     logger.info(f"Fetching GDELT data for Brazil (last {days} days)...")
 
-    end_date = datetime.now().strftime('%Y%m%d')
-    start_date = (datetime.now() - timedelta(days=days)).strftime('%Y%m%d')
+    end = datetime.now(timezone.utc) - GDELT_UPDATE_INTERVAL
+    start = (end - timedelta(days=days)).replace(hour=0, minute=0)
+    timestamps = gdelt_export_timestamps(start, end)
+
+    logger.info(f"Date range: {start:%Y%m%d} to {end:%Y%m%d} ({len(timestamps)} export files)")
 
-    logger.info(f"Date range: {start_date} to {end_date}")
+    chunks = []
+    total_records = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fetch_brazil_events_file, ts) for ts in timestamps]
 
-    gd = gdelt.gdelt(version=2)
-    df = gd.Search([start_date, end_date], table='events', coverage=True)
+        for completed, future in enumerate(as_completed(futures), 1):
+            df_chunk, n_records = future.result()
+            total_records += n_records
+            if not df_chunk.empty:
+                chunks.append(df_chunk)
 
-    if df is None or df.empty:
+            if completed % 100 == 0:
+                logger.info(f"Progress: {completed}/{len(timestamps)} export files processed")
+
+    if not chunks:
         logger.warning("No data retrieved")
         return pd.DataFrame()
 
-    logger.info(f"Total records downloaded: {len(df)}")
-
-    mask = df['Actor1Code'].apply(
-        lambda x: str(x).startswith('BR') if pd.notna(x) else False
-    )
-    df_brazil = df[mask]
+    df_brazil = pd.concat(chunks, ignore_index=True)
 
+    logger.info(f"Total records downloaded: {total_records}")
     logger.info(f"Brazil records: {len(df_brazil)}")
 
     df_brazil_democracy = filter_democracy_events(df_brazil)
@@ -191,51 +378,101 @@ def fetch_brazil_data(days=7):
     return df_brazil_democracy
 
 
-def enrich_urls_with_titles(df, max_workers=20):
+async def fetch_titles(urls, max_concurrency=100, timeout=5):
+    """
+    Fetch page titles for many URLs concurrently over a shared HTTP/2 client.
+
+    Args:
+        urls: Iterable of URLs to fetch
+        max_concurrency: Maximum number of requests in flight at once
+        timeout: Request timeout in seconds (default: 5)
+
+    Returns:
+        Dict mapping each URL to its page title (None if unavailable)
+    """
+    urls = list(urls)
+    total_urls = len(urls)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limits = httpx.Limits(max_connections=200, max_keepalive_connections=50)
+
+    async with httpx.AsyncClient(
+        http2=True,
+        timeout=timeout,
+        follow_redirects=True,
+        headers=HTTP_HEADERS,
+        limits=limits
+    ) as client:
+
+        async def fetch_one(url):
+            async with semaphore:
+                try:
+                    async with client.stream('GET', url, headers=TITLE_REQUEST_HEADERS) as response:
+                        response.raise_for_status()
+                        content = bytearray()
+                        async for chunk in response.aiter_bytes():
+                            content.extend(chunk)
+                            if len(content) >= TITLE_SCAN_BYTES:
+                                break
+                    return url, parse_title(bytes(content), response.charset_encoding)
+                except httpx.TimeoutException:
+                    logger.warning(f"Timeout fetching title from {url}")
+                except httpx.HTTPError as e:
+                    logger.warning(f"Error fetching title from {url}: {e}")
+                except Exception as e:
+                    logger.warning(f"Unexpected error fetching title from {url}: {e}")
+                return url, None
+
+        url_titles = {}
+        tasks = [fetch_one(url) for url in urls]
+
+        for completed, task in enumerate(asyncio.as_completed(tasks), 1):
+            url, title = await task
+            url_titles[url] = title
+
+            if completed % 100 == 0:
+                logger.info(f"Progress: {completed}/{total_urls} URLs processed")
+
+    return url_titles
+
+
+def enrich_urls_with_titles(df, max_concurrency=100):
     """
     Enrich DataFrame with URL titles.
 
     Args:
         df: DataFrame with SOURCEURL column
-        max_workers: Number of concurrent workers for fetching titles
+        max_concurrency: Maximum number of concurrent title requests
 
     Returns:
-        DataFrame with added 'url_title' column
+        New DataFrame with added 'url_title' column (the input is not modified)
     """
     if df.empty:
         return df
 
-    df = df.copy()
-
     unique_urls = df['SOURCEURL'].dropna().unique()
     total_urls = len(unique_urls)
 
-    logger.info(f"Fetching titles for {total_urls} unique URLs using {max_workers} workers...")
-
+    cache = _get_title_cache()
     url_titles = {}
-    successful_fetches = 0
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {executor.submit(get_page_title, url): url for url in unique_urls}
+    urls_to_fetch = []
+    for url in unique_urls:
+        cached = cache.get(url, default=_CACHE_MISS)
+        if cached is _CACHE_MISS:
+            urls_to_fetch.append(url)
+        else:
+            url_titles[url] = cached
 
-        completed = 0
-        for future in as_completed(future_to_url):
-            url = future_to_url[future]
-            completed += 1
+    logger.info(f"Found {len(url_titles)}/{total_urls} titles in cache")
+    logger.info(f"Fetching titles for {len(urls_to_fetch)} URLs with up to {max_concurrency} concurrent requests...")
 
-            if completed % 100 == 0:
-                logger.info(f"Progress: {completed}/{total_urls} URLs processed")
+    fetched_titles = asyncio.run(fetch_titles(urls_to_fetch, max_concurrency=max_concurrency))
+    for url, title in fetched_titles.items():
+        _cache_title(url, title)
+    url_titles.update(fetched_titles)
 
-            try:
-                title = future.result()
-                url_titles[url] = title
-                if title:
-                    successful_fetches += 1
-            except Exception as e:
-                logger.warning(f"Error fetching title for {url}: {e}")
-                url_titles[url] = None
+    successful_fetches = sum(1 for title in url_titles.values() if title)
 
-    df['url_title'] = df['SOURCEURL'].map(url_titles)
+    df = df.assign(url_title=df['SOURCEURL'].map(url_titles))
 
     logger.info(f"Successfully fetched {successful_fetches}/{total_urls} titles ({successful_fetches/total_urls*100:.1f}%)")
 
@@ -268,7 +505,7 @@ def main():
         logger.error("No data to process")
         return
 
-    enriched_data = enrich_urls_with_titles(data, max_workers=20)
+    enriched_data = enrich_urls_with_titles(data, max_concurrency=100)
 
     output_file = save_data(enriched_data)
 
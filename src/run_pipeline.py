@@ -91,9 +91,11 @@ def main():
     print_header("PIPELINE COMPLETED SUCCESSFULLY!")
     print("Output files generated:")
     print("  • data/gdelt_brazil_data.csv")
-    print("  • data/gdelt_brazil_data_enriched.csv")
+    print("  • data/gdelt_brazil_data_enriched.parquet")
+    print("  • data/gdelt_brazil_data_enriched.npy")
     print("  • data/gdelt_brazil_data_clustered.csv")
     print("  • docs/index.html")
+    print("  • docs/index.html.gz")
     print()
     print("Open 'docs/index.html' in your browser to explore!")
     print()
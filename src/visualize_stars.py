@@ -7,12 +7,39 @@ Reduces embeddings to 2D and displays news titles as stars in space.
 import pandas as pd
 import numpy as np
 import logging
-import json
+import base64
+import gzip
+import orjson
+import re
+import shutil
+import string
+import zlib
+from collections import Counter
+from itertools import chain
 from pathlib import Path
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+TITLE_WORD_RE = re.compile(r'\b[a-z]{4,}\b')
+
+# Columns read by prepare_visualization_data; the rest of the clustered CSV
+# is skipped at parse time. CAMEO codes keep their leading zeros ('010',
+# '01'), so they are read as text.
+VIS_COLUMN_DTYPES = {
+    'x_2d': 'float32',
+    'y_2d': 'float32',
+    'cluster': 'int32',
+    'cluster_keywords': str,
+    'url_title': str,
+    'SQLDATE': str,
+    'SOURCEURL': str,
+    'GoldsteinScale': 'float32',
+    'EventCode': str,
+    'EventRootCode': str,
+    'ActionGeo_FullName': 'category'
+}
+
 
 def load_clustered_data(input_file='data/gdelt_brazil_data_clustered.csv'):
     """Load clustered GDELT data from CSV file."""
@@ -22,7 +49,7 @@ def load_clustered_data(input_file='data/gdelt_brazil_data_clustered.csv'):
         raise FileNotFoundError(f"Input file not found: {input_path}")
 
     logger.info(f"Loading clustered data from: {input_path.absolute()}")
-    df = pd.read_csv(input_path)
+    df = pd.read_csv(input_path, usecols=lambda c: c in VIS_COLUMN_DTYPES, dtype=VIS_COLUMN_DTYPES)
     logger.info(f"Loaded {len(df)} records")
 
     if 'x_2d' not in df.columns or 'y_2d' not in df.columns:
@@ -33,6 +60,13 @@ def load_clustered_data(input_file='data/gdelt_brazil_data_clustered.csv'):
     return df
 
 
+def _column(df, name, default):
+    """Return a column as a Series, or a constant Series if it is missing."""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(default, index=df.index)
+
+
 def prepare_visualization_data(df):
     """
     Prepare data for visualization.
@@ -41,111 +75,221 @@ def prepare_visualization_data(df):
         df: DataFrame with cluster, title, and 2D coordinate information
 
     Returns:
-        Tuple of (vis_data, metadata) where metadata contains country and top words
+        Tuple of (vis_data, metadata). vis_data maps each field to a column:
+        NumPy arrays for x, y, cluster and goldstein, lists of strings for the
+        rest. metadata contains country, top words and per-cluster centers
+        with their keywords.
     """
     logger.info("Preparing visualization data...")
 
-    vis_data = []
-    for idx, row in df.iterrows():
-        event_code = str(row.get('EventCode', ''))
-        event_root_code = str(row.get('EventRootCode', event_code[:2] if len(event_code) >= 2 else ''))
-
-        vis_data.append({
-            'x': float(row['x_2d']),
-            'y': float(row['y_2d']),
-            'title': str(row.get('url_title', 'N/A')),
-            'cluster': int(row.get('cluster', 0)),
-            'keywords': str(row.get('cluster_keywords', '')),
-            'date': str(row.get('SQLDATE', 'N/A')),
-            'url': str(row.get('SOURCEURL', '')),
-            'goldstein': float(row.get('GoldsteinScale', 0)) if pd.notna(row.get('GoldsteinScale')) else 0,
-            'eventCode': event_code,
-            'eventRootCode': event_root_code
-        })
+    # Files written before the CAMEO codes were read as text hold them as
+    # numbers ('1', or '1.0' when the column had gaps); drop the float
+    # suffix, and since root codes are always two digits, restore their
+    # leading zero. Rows without an EventRootCode fall back to the first two
+    # digits of their EventCode.
+    event_codes = _column(df, 'EventCode', '').fillna('').astype(str).str.replace(r'\.0$', '', regex=True)
+    event_root_codes = (
+        _column(df, 'EventRootCode', None).astype('string').str.replace(r'\.0$', '', regex=True)
+        .str.zfill(2)
+        .fillna(event_codes.str[:2])
+        .astype(str)
+    )
+
+    goldstein = pd.to_numeric(_column(df, 'GoldsteinScale', 0), errors='coerce').fillna(0)
+
+    vis_data = {
+        'x': df['x_2d'].to_numpy(dtype=np.float32),
+        'y': df['y_2d'].to_numpy(dtype=np.float32),
+        'cluster': _column(df, 'cluster', 0).fillna(0).to_numpy(dtype=np.int32),
+        'goldstein': goldstein.to_numpy(dtype=np.float32),
+        'title': _column(df, 'url_title', 'N/A').fillna('N/A').astype(str).tolist(),
+        'date': _column(df, 'SQLDATE', 'N/A').fillna('N/A').astype(str).tolist(),
+        'url': _column(df, 'SOURCEURL', '').fillna('').astype(str).tolist(),
+        'eventCode': event_codes.tolist(),
+        'eventRootCode': event_root_codes.tolist()
+    }
 
     country_name = 'Unknown'
     if 'ActionGeo_FullName' in df.columns:
-        country_mentions = df['ActionGeo_FullName'].value_counts()
-        if len(country_mentions) > 0:
-            top_location = str(country_mentions.index[0])
+        top_locations = df['ActionGeo_FullName'].mode(dropna=True)
+        if len(top_locations) > 0:
+            top_location = str(top_locations.iat[0])
             if ',' in top_location:
                 country_name = top_location.split(',')[-1].strip()
             else:
                 country_name = top_location.strip()
 
-    from collections import Counter
-    import re
-
-    all_words = []
-    for title in df['url_title'].dropna():
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', title.lower())
-        all_words.extend(words)
+    word_counts = Counter(chain.from_iterable(
+        df['url_title'].dropna().astype(str).str.lower().str.findall(TITLE_WORD_RE)
+    ))
 
     stop_words = {'that', 'this', 'with', 'from', 'have', 'been', 'were', 'will',
                   'their', 'there', 'what', 'when', 'where', 'which', 'about',
                   'after', 'says', 'over', 'more', 'than', 'into', 'could', 'would'}
 
-    filtered_words = [w for w in all_words if w not in stop_words]
-    word_counts = Counter(filtered_words)
+    # Drop the stop words from the counts instead of filtering every token
+    for word in stop_words:
+        word_counts.pop(word, None)
+
     top_words = [word for word, count in word_counts.most_common(5)]
 
+    # Per-cluster mean position via bincount over the cluster ids. Keywords
+    # are the same for every member of a cluster, so they are kept once per
+    # cluster (taken from its first row) instead of once per point
+    keywords = _column(df, 'cluster_keywords', '').fillna('').astype(str).to_numpy()
+    cluster_ids, first_rows, inverse, counts = np.unique(
+        vis_data['cluster'], return_index=True, return_inverse=True, return_counts=True
+    )
+    center_x = np.bincount(inverse, weights=vis_data['x'], minlength=len(cluster_ids)) / counts
+    center_y = np.bincount(inverse, weights=vis_data['y'], minlength=len(cluster_ids)) / counts
+
+    # Labels are drawn every frame, so split and uppercase them once here
+    cluster_centers = [
+        {
+            'cluster': cluster_id,
+            'x': x,
+            'y': y,
+            'keywords': keywords[row],
+            'labels': [k.strip().upper() for k in keywords[row].split(',') if k.strip()]
+        }
+        for cluster_id, x, y, row in zip(cluster_ids, center_x, center_y, first_rows)
+    ]
+
     metadata = {
         'country': country_name,
-        'top_words': top_words
+        'top_words': top_words,
+        'cluster_centers': cluster_centers
     }
 
-    logger.info(f"Prepared {len(vis_data)} data points")
+    logger.info(f"Prepared {len(df)} data points")
     logger.info(f"Country: {country_name}")
     logger.info(f"Top words: {', '.join(top_words)}")
 
     return vis_data, metadata
 
 
-def generate_html(vis_data, metadata, output_file='docs/index.html'):
-    """Generate modern interactive HTML visualization."""
-    output_path = Path(__file__).parent.parent / output_file
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+BASE64_CHUNK_BYTES = 3 * 65536
 
-    country_name = metadata.get('country', 'Unknown')
-    top_words = metadata.get('top_words', [])
 
-    cluster_colors = [
-        '#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8',
-        '#F7DC6F', '#BB8FCE', '#85C1E2', '#F8B88B', '#ABEBC6'
-    ]
+def _write_base64(f, values, dtype):
+    """
+    Write a NumPy array to a binary file as base64 of its raw bytes.
+
+    Args:
+        f: Binary file opened for writing
+        values: Array-like to encode
+        dtype: NumPy dtype the values are cast to before encoding
+    """
+    raw = np.ascontiguousarray(values, dtype=dtype).reshape(-1).view(np.uint8)
+
+    # Chunks are a multiple of 3 bytes so they encode without padding
+    for start in range(0, len(raw), BASE64_CHUNK_BYTES):
+        f.write(base64.b64encode(raw[start:start + BASE64_CHUNK_BYTES]))
+
+
+def _quantize_positions(x, y):
+    """
+    Quantize 2D positions to 16-bit integers over their bounding box.
+
+    Args:
+        x: Array of x coordinates
+        y: Array of y coordinates
+
+    Returns:
+        Tuple of (uint16 array of interleaved x, y pairs, [min_x, min_y],
+        [span_x, span_y]). A position is recovered as min + q / 65535 * span.
+    """
+    xy = np.column_stack([x, y]).astype(np.float64)
+    if len(xy) == 0:
+        return np.empty((0, 2), dtype=np.uint16), [0.0, 0.0], [1.0, 1.0]
+
+    low = xy.min(axis=0)
+    span = xy.max(axis=0) - low
+    span[span == 0] = 1.0
 
-    vis_data_json = json.dumps(vis_data)
+    quantized = np.rint((xy - low) / span * 65535).astype(np.uint16)
+    return quantized, low.tolist(), span.tolist()
 
-    html_content = f"""<!DOCTYPE html>
+
+def _script_json(obj):
+    """Serialize to compact JSON that is safe to inline in a <script> tag."""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).replace(b'</', b'<\\/').decode('utf-8')
+
+
+def _write_deflated_json(f, columns):
+    """
+    Write a dict of columns to a binary file as base64 of zlib-deflated JSON.
+
+    Args:
+        f: Binary file opened for writing
+        columns: Dict mapping field names to lists or arrays
+
+    Each column is serialized and fed to the compressor on its own, so only
+    one column's JSON is held in memory at a time.
+    """
+    compressor = zlib.compressobj(9)
+    pending = b''
+
+    def write_compressed(data):
+        nonlocal pending
+        pending += data
+        # Only encode whole 3-byte groups so no padding lands mid-stream
+        cut = len(pending) - len(pending) % 3
+        f.write(base64.b64encode(pending[:cut]))
+        pending = pending[cut:]
+
+    for i, (name, values) in enumerate(columns.items()):
+        write_compressed(compressor.compress(b',' if i else b'{'))
+        write_compressed(compressor.compress(orjson.dumps(name) + b':'))
+        write_compressed(compressor.compress(orjson.dumps(values, option=orjson.OPT_SERIALIZE_NUMPY)))
+    write_compressed(compressor.compress(b'}' if columns else b'{}'))
+    write_compressed(compressor.flush())
+    f.write(base64.b64encode(pending))
+
+
+class _PageTemplate(string.Template):
+    """string.Template with a '$$' delimiter, so the page's JS ${...} literals pass through."""
+    delimiter = '$$'
+
+
+# Page shell. $$-placeholders are substituted per page; the __*_DATA__ slots
+# are filled by streaming the per-point payloads in generate_html.
+PAGE_TEMPLATE = _PageTemplate("""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{country_name} - GDELT News Visualization</title>
+    <title>$$country_name - GDELT News Visualization</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             background: #000000;
             color: #ffffff;
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             overflow: hidden;
             width: 100vw;
             height: 100vh;
-        }}
+        }
 
-        #canvas {{
+        #gl-canvas, #canvas {
+            position: fixed;
+            top: 0;
+            left: 0;
             display: block;
             width: 100%;
             height: 100%;
+        }
+
+        #canvas {
             cursor: crosshair;
-        }}
+        }
 
-        #info-panel {{
+        #info-panel {
             position: fixed;
             top: 20px;
             left: 20px;
@@ -156,22 +300,22 @@ def generate_html(vis_data, metadata, output_file='docs/index.html'):
             max-width: 300px;
             backdrop-filter: blur(10px);
             z-index: 100;
-        }}
+        }
 
-        #info-panel h1 {{
+        #info-panel h1 {
             font-size: 18px;
             margin-bottom: 10px;
             color: #4ECDC4;
-        }}
+        }
 
-        #info-panel p {{
+        #info-panel p {
             font-size: 12px;
             line-height: 1.6;
             color: #cccccc;
             margin-bottom: 5px;
-        }}
+        }
 
-        #tooltip {{
+        #tooltip {
             position: fixed;
             background: rgba(0, 0, 0, 0.95);
             border: 1px solid rgba(255, 255, 255, 0.3);
@@ -182,36 +326,36 @@ def generate_html(vis_data, metadata, output_file='docs/index.html'):
             z-index: 1000;
             max-width: 400px;
             box-shadow: 0 4px 20px rgba(0, 0, 0, 0.5);
-        }}
+        }
 
-        #tooltip.visible {{
+        #tooltip.visible {
             display: block;
-        }}
+        }
 
-        #tooltip .title {{
+        #tooltip .title {
             font-size: 14px;
             font-weight: 600;
             margin-bottom: 8px;
             color: #ffffff;
             line-height: 1.4;
-        }}
+        }
 
-        #tooltip .meta {{
+        #tooltip .meta {
             font-size: 11px;
             color: #999999;
             margin-bottom: 4px;
-        }}
+        }
 
-        #tooltip .keywords {{
+        #tooltip .keywords {
             font-size: 12px;
             color: #4ECDC4;
             margin-top: 8px;
             padding-top: 8px;
             border-top: 1px solid rgba(255, 255, 255, 0.1);
-        }}
+        }
 
 
-        #controls {{
+        #controls {
             position: fixed;
             top: 20px;
             right: 20px;
@@ -220,9 +364,9 @@ def generate_html(vis_data, metadata, output_file='docs/index.html'):
             border-radius: 8px;
             padding: 15px;
             backdrop-filter: blur(10px);
-        }}
+        }
 
-        #controls button {{
+        #controls button {
             background: rgba(78, 205, 196, 0.2);
             border: 1px solid #4ECDC4;
             color: #4ECDC4;
@@ -233,30 +377,30 @@ def generate_html(vis_data, metadata, output_file='docs/index.html'):
             margin-bottom: 8px;
             width: 100%;
             transition: all 0.2s;
-        }}
+        }
 
-        #controls button:hover {{
+        #controls button:hover {
             background: rgba(78, 205, 196, 0.4);
-        }}
+        }
 
-        #controls button.active {{
+        #controls button.active {
             background: rgba(78, 205, 196, 0.6);
             border: 1px solid #45B7D1;
-        }}
+        }
 
-        #controls .control-group {{
+        #controls .control-group {
             margin-bottom: 15px;
-        }}
+        }
 
-        #controls .control-label {{
+        #controls .control-label {
             font-size: 10px;
             color: #999999;
             text-transform: uppercase;
             letter-spacing: 1px;
             margin-bottom: 8px;
-        }}
+        }
 
-        #legend {{
+        #legend {
             position: fixed;
             bottom: 20px;
             left: 20px;
@@ -269,79 +413,80 @@ def generate_html(vis_data, metadata, output_file='docs/index.html'):
             overflow-y: auto;
             backdrop-filter: blur(10px);
             z-index: 100;
-        }}
+        }
 
-        #legend h3 {{
+        #legend h3 {
             font-size: 14px;
             margin-bottom: 10px;
             color: #4ECDC4;
             text-transform: uppercase;
             letter-spacing: 1px;
-        }}
+        }
 
-        .legend-item {{
+        .legend-item {
             display: flex;
             align-items: center;
             margin-bottom: 8px;
             font-size: 11px;
-        }}
+        }
 
-        .legend-color {{
+        .legend-color {
             width: 20px;
             height: 20px;
             border-radius: 3px;
             margin-right: 10px;
             flex-shrink: 0;
-        }}
+        }
 
-        .legend-label {{
+        .legend-label {
             color: #cccccc;
             line-height: 1.3;
-        }}
+        }
 
-        .legend-gradient {{
+        .legend-gradient {
             width: 100%;
             height: 20px;
             border-radius: 3px;
             margin-bottom: 8px;
-        }}
+        }
 
-        .legend-scale {{
+        .legend-scale {
             display: flex;
             justify-content: space-between;
             font-size: 10px;
             color: #999999;
             margin-bottom: 5px;
-        }}
+        }
 
-        #legend::-webkit-scrollbar {{
+        #legend::-webkit-scrollbar {
             width: 6px;
-        }}
+        }
 
-        #legend::-webkit-scrollbar-track {{
+        #legend::-webkit-scrollbar-track {
             background: rgba(255, 255, 255, 0.05);
             border-radius: 3px;
-        }}
+        }
 
-        #legend::-webkit-scrollbar-thumb {{
+        #legend::-webkit-scrollbar-thumb {
             background: rgba(78, 205, 196, 0.3);
             border-radius: 3px;
-        }}
+        }
 
-        #legend::-webkit-scrollbar-thumb:hover {{
+        #legend::-webkit-scrollbar-thumb:hover {
             background: rgba(78, 205, 196, 0.5);
-        }}
+        }
     </style>
 </head>
 <body>
+    <canvas id="gl-canvas"></canvas>
     <canvas id="canvas"></canvas>
 
     <div id="info-panel">
-        <h1>{country_name}</h1>
+        <h1>$$country_name</h1>
         <p><strong>Total Events:</strong> <span id="total-events">0</span></p>
         <p><strong>Clusters:</strong> <span id="total-clusters">0</span></p>
         <p style="margin-top: 10px;"><strong>Top Words:</strong></p>
-        <p style="font-size: 11px; color: #4ECDC4; text-transform: uppercase; letter-spacing: 1px;">{' · '.join(top_words)}</p>
+        <p style="font-size: 11px; color: #4ECDC4; text-transform: uppercase; letter-spacing: 1px;">$$top_words</p>
         <p style="margin-top: 10px; font-size: 11px;">Hover over stars to see details. Scroll to zoom. Drag to pan.</p>
     </div>
 
@@ -366,11 +511,157 @@ def generate_html(vis_data, metadata, output_file='docs/index.html'):
     </div>
 
     <script>
-        const data = {vis_data_json};
-        const colors = {json.dumps(cluster_colors)};
+        function decodeBase64(b64) {
+            const binary = atob(b64);
+            const bytes = new Uint8Array(binary.length);
+            for (let i = 0; i < binary.length; i++) {
+                bytes[i] = binary.charCodeAt(i);
+            }
+            return bytes.buffer;
+        }
+
+        const xyQuantized = new Uint16Array(decodeBase64("__XY_DATA__"));
+        const xyLow = $$xy_low;
+        const xySpan = $$xy_span;
+        const xy = new Float32Array(xyQuantized.length);
+        for (let i = 0; i < xy.length; i++) {
+            xy[i] = xyLow[i & 1] + xyQuantized[i] / 65535 * xySpan[i & 1];
+        }
+        const clusterIds = new Int32Array(decodeBase64("__CLUSTER_DATA__"));
+        const goldsteins = new Float32Array(decodeBase64("__GOLDSTEIN_DATA__"));
+        // The text columns ship deflate-compressed and are inflated
+        // asynchronously; stars render right away, tooltips once they land
+        const strings = $$empty_strings;
+        let stringsLoaded = false;
+
+        // Minimal zlib inflate for browsers without DecompressionStream
+        const LENGTH_BASE = [3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 15, 17, 19, 23, 27, 31,
+            35, 43, 51, 59, 67, 83, 99, 115, 131, 163, 195, 227, 258];
+        const LENGTH_EXTRA = [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2,
+            3, 3, 3, 3, 4, 4, 4, 4, 5, 5, 5, 5, 0];
+        const DIST_BASE = [1, 2, 3, 4, 5, 7, 9, 13, 17, 25, 33, 49, 65, 97, 129, 193,
+            257, 385, 513, 769, 1025, 1537, 2049, 3073, 4097, 6145, 8193, 12289, 16385, 24577];
+        const DIST_EXTRA = [0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6,
+            7, 7, 8, 8, 9, 9, 10, 10, 11, 11, 12, 12, 13, 13];
+        const CODE_LENGTH_ORDER = [16, 17, 18, 0, 8, 7, 9, 6, 10, 5, 11, 4, 12, 3, 13, 2, 14, 1, 15];
+
+        function inflateSync(data) {
+            let pos = 2, bitBuf = 0, bitCnt = 0;  // skip the 2-byte zlib header
+            let out = new Uint8Array(data.length * 4), len = 0;
+
+            const bits = n => {
+                while (bitCnt < n) {
+                    bitBuf |= data[pos++] << bitCnt;
+                    bitCnt += 8;
+                }
+                const value = bitBuf & ((1 << n) - 1);
+                bitBuf >>>= n;
+                bitCnt -= n;
+                return value;
+            };
+            const reserve = n => {
+                if (len + n <= out.length) return;
+                const grown = new Uint8Array(Math.max(out.length * 2, len + n));
+                grown.set(out);
+                out = grown;
+            };
+            // Canonical Huffman table: code counts per length plus symbols in code order
+            const buildTable = lengths => {
+                const counts = new Uint16Array(16);
+                const offsets = new Uint16Array(16);
+                const symbols = new Uint16Array(lengths.length);
+                lengths.forEach(l => counts[l]++);
+                counts[0] = 0;
+                for (let l = 1; l < 16; l++) offsets[l] = offsets[l - 1] + counts[l - 1];
+                lengths.forEach((l, symbol) => { if (l) symbols[offsets[l]++] = symbol; });
+                return {counts, symbols};
+            };
+            const decode = table => {
+                let code = 0, first = 0, index = 0;
+                for (let l = 1; l < 16; l++) {
+                    code |= bits(1);
+                    const count = table.counts[l];
+                    if (code - first < count) return table.symbols[index + code - first];
+                    index += count;
+                    first = (first + count) << 1;
+                    code <<= 1;
+                }
+                throw new Error('Invalid deflate data');
+            };
+
+            let final;
+            do {
+                final = bits(1);
+                const type = bits(2);
+                if (type === 0) {
+                    bitBuf = bitCnt = 0;
+                    const size = data[pos] | (data[pos + 1] << 8);
+                    pos += 4;
+                    reserve(size);
+                    out.set(data.subarray(pos, pos + size), len);
+                    pos += size;
+                    len += size;
+                    continue;
+                }
+
+                let lit, dist;
+                if (type === 1) {
+                    const lengths = new Array(288).fill(8, 0, 144).fill(9, 144, 256).fill(7, 256, 280).fill(8, 280);
+                    lit = buildTable(lengths);
+                    dist = buildTable(new Array(30).fill(5));
+                } else if (type === 2) {
+                    const nLit = bits(5) + 257, nDist = bits(5) + 1, nCode = bits(4) + 4;
+                    const codeLengths = new Array(19).fill(0);
+                    for (let i = 0; i < nCode; i++) codeLengths[CODE_LENGTH_ORDER[i]] = bits(3);
+                    const codeTable = buildTable(codeLengths);
+                    const lengths = [];
+                    while (lengths.length < nLit + nDist) {
+                        const symbol = decode(codeTable);
+                        if (symbol < 16) lengths.push(symbol);
+                        else if (symbol === 16) lengths.push(...new Array(3 + bits(2)).fill(lengths[lengths.length - 1]));
+                        else if (symbol === 17) lengths.push(...new Array(3 + bits(3)).fill(0));
+                        else lengths.push(...new Array(11 + bits(7)).fill(0));
+                    }
+                    lit = buildTable(lengths.slice(0, nLit));
+                    dist = buildTable(lengths.slice(nLit));
+                } else {
+                    throw new Error('Invalid deflate block type');
+                }
+
+                for (let symbol = decode(lit); symbol !== 256; symbol = decode(lit)) {
+                    if (symbol < 256) {
+                        reserve(1);
+                        out[len++] = symbol;
+                        continue;
+                    }
+                    symbol -= 257;
+                    const length = LENGTH_BASE[symbol] + bits(LENGTH_EXTRA[symbol]);
+                    const d = decode(dist);
+                    const distance = DIST_BASE[d] + bits(DIST_EXTRA[d]);
+                    reserve(length);
+                    for (let i = 0; i < length; i++, len++) out[len] = out[len - distance];
+                }
+            } while (!final);
+
+            return out.subarray(0, len);
+        }
+
+        async function inflateJSON(b64) {
+            const bytes = decodeBase64(b64);
+            if (typeof DecompressionStream === 'undefined') {
+                return JSON.parse(new TextDecoder().decode(inflateSync(new Uint8Array(bytes))));
+            }
+            const stream = new Blob([bytes]).stream()
+                .pipeThrough(new DecompressionStream('deflate'));
+            return new Response(stream).json();
+        }
+        const N = clusterIds.length;
+        const colors = $$cluster_colors;
 
         const canvas = document.getElementById('canvas');
         const ctx = canvas.getContext('2d');
+        const glCanvas = document.getElementById('gl-canvas');
+        const gl = glCanvas.getContext('webgl2', { alpha: false, antialias: false });
         const tooltip = document.getElementById('tooltip');
 
         let width = window.innerWidth;
@@ -384,7 +675,7 @@ def generate_html(vis_data, metadata, output_file='docs/index.html'):
         let showWords = true;
         let colorMode = 'cluster';
 
-        const eventCategoryColors = {{
+        const eventCategoryColors = {
             '01': '#FF6B6B',
             '02': '#4ECDC4',
             '03': '#45B7D1',
@@ -405,9 +696,9 @@ def generate_html(vis_data, metadata, output_file='docs/index.html'):
             '18': '#922B21',
             '19': '#641E16',
             '20': '#34495E',
-        }};
+        };
 
-        const eventCategoryNames = {{
+        const eventCategoryNames = {
             '01': 'Make public statement',
             '02': 'Appeal',
             '03': 'Express intent to cooperate',
@@ -428,235 +719,628 @@ def generate_html(vis_data, metadata, output_file='docs/index.html'):
             '18': 'Assault',
             '19': 'Fight',
             '20': 'Use unconventional mass violence',
-        }};
+        };
+
+        function resizeCanvases() {
+            [canvas, glCanvas].forEach(c => {
+                c.width = width * window.devicePixelRatio;
+                c.height = height * window.devicePixelRatio;
+                c.style.width = width + 'px';
+                c.style.height = height + 'px';
+            });
+            ctx.scale(window.devicePixelRatio, window.devicePixelRatio);
+            if (gl) {
+                gl.viewport(0, 0, glCanvas.width, glCanvas.height);
+            }
+        }
 
-        canvas.width = width * window.devicePixelRatio;
-        canvas.height = height * window.devicePixelRatio;
-        canvas.style.width = width + 'px';
-        canvas.style.height = height + 'px';
-        ctx.scale(window.devicePixelRatio, window.devicePixelRatio);
+        resizeCanvases();
 
-        window.addEventListener('resize', () => {{
+        window.addEventListener('resize', () => {
             width = window.innerWidth;
             height = window.innerHeight;
-            canvas.width = width * window.devicePixelRatio;
-            canvas.height = height * window.devicePixelRatio;
-            canvas.style.width = width + 'px';
-            canvas.style.height = height + 'px';
-            ctx.scale(window.devicePixelRatio, window.devicePixelRatio);
-            draw();
-        }});
+            resizeCanvases();
+            requestDraw();
+        });
 
-        function worldToScreen(x, y) {{
-            return {{
+        function worldToScreen(x, y) {
+            return {
                 x: (x * width + offsetX) * scale,
                 y: (y * height + offsetY) * scale
-            }};
-        }}
+            };
+        }
 
-        function screenToWorld(x, y) {{
-            return {{
+        function screenToWorld(x, y) {
+            return {
                 x: (x / scale - offsetX) / width,
                 y: (y / scale - offsetY) / height
-            }};
-        }}
-
-        function calculateClusterCenters() {{
-            const clusters = {{}};
-
-            data.forEach(point => {{
-                if (!clusters[point.cluster]) {{
-                    clusters[point.cluster] = {{
-                        x: 0,
-                        y: 0,
-                        count: 0,
-                        keywords: point.keywords,
-                        color: colors[point.cluster % colors.length]
-                    }};
-                }}
-                clusters[point.cluster].x += point.x;
-                clusters[point.cluster].y += point.y;
-                clusters[point.cluster].count += 1;
-            }});
-
-            Object.keys(clusters).forEach(key => {{
-                clusters[key].x /= clusters[key].count;
-                clusters[key].y /= clusters[key].count;
-            }});
-
-            return clusters;
-        }}
-
-        const clusterCenters = calculateClusterCenters();
-
-        function getPointColor(point) {{
-            if (colorMode === 'cluster') {{
-                return colors[point.cluster % colors.length];
-            }} else if (colorMode === 'goldstein') {{
-                const normalized = (point.goldstein + 10) / 20;
-                const r = Math.floor(255 * (1 - normalized));
-                const g = Math.floor(255 * normalized);
-                return `rgb(${{r}}, ${{g}}, 100)`;
-            }} else if (colorMode === 'event') {{
-                const category = point.eventRootCode || '01';
-                return eventCategoryColors[category] || '#999999';
-            }}
-            return '#999999';
-        }}
-
-        function draw() {{
-            ctx.clearRect(0, 0, width, height);
+            };
+        }
+
+        const clusterCenters = $$cluster_centers;
+        const clusterKeywords = {};
+        clusterCenters.forEach(cluster => {
+            cluster.color = colors[cluster.cluster % colors.length];
+            clusterKeywords[cluster.cluster] = cluster.keywords;
+        });
+
+        // Goldstein scores (-10..10) map onto a 256-step red-to-green ramp,
+        // built once instead of formatting an rgb() string per star
+        const goldsteinColors = new Array(256);
+        for (let k = 0; k < 256; k++) {
+            goldsteinColors[k] = `rgb(${255 - k}, ${k}, 100)`;
+        }
+
+        // Each color mode is materialized once as a small palette plus a
+        // per-point index into it, so drawing a star is a single lookup.
+        // Cached per mode; the event mode is rebuilt once the text columns
+        // (which hold the event codes) have been inflated.
+        const colorIndexCache = {};
+        let activePalette = colors;
+        let activeColorIndex = new Uint8Array(N);
+
+        function buildColorIndex(mode) {
+            const index = new Uint8Array(N);
+
+            if (mode === 'cluster') {
+                for (let i = 0; i < N; i++) {
+                    index[i] = clusterIds[i] % colors.length;
+                }
+                return { palette: colors, index };
+            } else if (mode === 'goldstein') {
+                for (let i = 0; i < N; i++) {
+                    const k = Math.floor((goldsteins[i] + 10) / 20 * 255);
+                    index[i] = Math.max(0, Math.min(255, k));
+                }
+                return { palette: goldsteinColors, index };
+            } else if (mode === 'event') {
+                const categories = Object.keys(eventCategoryColors);
+                const palette = categories.map(c => eventCategoryColors[c]).concat(['#999999']);
+                const categoryIndex = {};
+                categories.forEach((c, k) => {
+                    categoryIndex[c] = k;
+                });
+                for (let i = 0; i < N; i++) {
+                    const k = categoryIndex[strings.eventRootCode[i] || '01'];
+                    index[i] = k === undefined ? palette.length - 1 : k;
+                }
+                return { palette, index };
+            }
+            return { palette: ['#999999'], index };
+        }
+
+        function selectColorIndex() {
+            if (!(colorMode in colorIndexCache)) {
+                colorIndexCache[colorMode] = buildColorIndex(colorMode);
+            }
+            activePalette = colorIndexCache[colorMode].palette;
+            activeColorIndex = colorIndexCache[colorMode].index;
+        }
+
+        function getPointColor(i) {
+            return activePalette[activeColorIndex[i]];
+        }
+
+        // Stars are drawn by WebGL in a single draw call: positions are
+        // uploaded once, colors on color-mode changes, and pan/zoom only
+        // touch uniforms. The 2D canvas on top holds the keyword labels, and
+        // also draws the stars itself when WebGL2 is unavailable.
+        const starVertexShader = `#version 300 es
+            in vec2 aPosition;
+            in vec3 aColor;
+            uniform vec2 uViewport;
+            uniform vec2 uOffset;
+            uniform float uScale;
+            uniform float uRadius;
+            uniform float uPixelRatio;
+            out vec3 vColor;
+            out float vPhase;
+            void main() {
+                vec2 screen = (aPosition * uViewport + uOffset) * uScale;
+                vec2 clip = screen / uViewport * 2.0 - 1.0;
+                gl_Position = vec4(clip.x, -clip.y, 0.0, 1.0);
+                gl_PointSize = 2.0 * uRadius * uPixelRatio;
+                vColor = aColor;
+                vPhase = aPosition.x * 100.0;
+            }`;
+
+        const starFragmentShader = `#version 300 es
+            precision highp float;
+            in vec3 vColor;
+            in float vPhase;
+            uniform float uRadius;
+            uniform float uCoreSize;
+            uniform float uTime;
+            uniform bool uPulse;
+            out vec4 fragColor;
+            void main() {
+                float dist = length(gl_PointCoord - 0.5) * 2.0 * uRadius;
+                if (dist > uRadius) {
+                    discard;
+                }
+                float alpha = dist <= uCoreSize ? 1.0 : 0.3;
+                if (uPulse) {
+                    float ring = 2.0 * (uCoreSize + sin(uTime + vPhase) * 0.5);
+                    if (abs(dist - ring) < 0.5) {
+                        alpha = max(alpha, 0.5);
+                    }
+                }
+                fragColor = vec4(vColor, alpha);
+            }`;
+
+        function compileShader(type, source) {
+            const shader = gl.createShader(type);
+            gl.shaderSource(shader, source);
+            gl.compileShader(shader);
+            if (!gl.getShaderParameter(shader, gl.COMPILE_STATUS)) {
+                throw new Error(gl.getShaderInfoLog(shader));
+            }
+            return shader;
+        }
+
+        function createStarRenderer() {
+            const program = gl.createProgram();
+            gl.attachShader(program, compileShader(gl.VERTEX_SHADER, starVertexShader));
+            gl.attachShader(program, compileShader(gl.FRAGMENT_SHADER, starFragmentShader));
+            gl.linkProgram(program);
+            if (!gl.getProgramParameter(program, gl.LINK_STATUS)) {
+                throw new Error(gl.getProgramInfoLog(program));
+            }
+
+            const vao = gl.createVertexArray();
+            gl.bindVertexArray(vao);
+
+            const positionBuffer = gl.createBuffer();
+            gl.bindBuffer(gl.ARRAY_BUFFER, positionBuffer);
+            gl.bufferData(gl.ARRAY_BUFFER, xy, gl.STATIC_DRAW);
+            const positionLoc = gl.getAttribLocation(program, 'aPosition');
+            gl.enableVertexAttribArray(positionLoc);
+            gl.vertexAttribPointer(positionLoc, 2, gl.FLOAT, false, 0, 0);
+
+            const colorBuffer = gl.createBuffer();
+            gl.bindBuffer(gl.ARRAY_BUFFER, colorBuffer);
+            gl.bufferData(gl.ARRAY_BUFFER, N * 3, gl.DYNAMIC_DRAW);
+            const colorLoc = gl.getAttribLocation(program, 'aColor');
+            gl.enableVertexAttribArray(colorLoc);
+            gl.vertexAttribPointer(colorLoc, 3, gl.UNSIGNED_BYTE, true, 0, 0);
+
+            gl.bindVertexArray(null);
+
+            const uniforms = {};
+            ['uViewport', 'uOffset', 'uScale', 'uRadius', 'uPixelRatio', 'uCoreSize', 'uTime', 'uPulse'].forEach(name => {
+                uniforms[name] = gl.getUniformLocation(program, name);
+            });
+
+            // Point sprites larger than the GPU limit are silently clamped,
+            // which would cut the glow (and pulse ring) to a square
+            const maxPointSize = gl.getParameter(gl.ALIASED_POINT_SIZE_RANGE)[1];
+
+            return { program, vao, colorBuffer, uniforms, maxPointSize };
+        }
+
+        let starRenderer = null;
+        if (gl) {
+            try {
+                starRenderer = createStarRenderer();
+            } catch (err) {
+                console.warn('WebGL star renderer unavailable, falling back to 2D canvas:', err);
+            }
+        }
+
+        const rgbCache = {};
+
+        function cssToRGB(color) {
+            if (!(color in rgbCache)) {
+                if (color[0] === '#') {
+                    const value = parseInt(color.slice(1), 16);
+                    rgbCache[color] = [(value >> 16) & 255, (value >> 8) & 255, value & 255];
+                } else {
+                    rgbCache[color] = color.match(/\\d+/g).slice(0, 3).map(Number);
+                }
+            }
+            return rgbCache[color];
+        }
+
+        function updateStarColors() {
+            selectColorIndex();
+            if (!starRenderer) {
+                return;
+            }
+            const paletteRGB = activePalette.map(cssToRGB);
+            const pointColors = new Uint8Array(N * 3);
+            for (let i = 0; i < N; i++) {
+                const rgb = paletteRGB[activeColorIndex[i]];
+                pointColors[3 * i] = rgb[0];
+                pointColors[3 * i + 1] = rgb[1];
+                pointColors[3 * i + 2] = rgb[2];
+            }
+            gl.bindBuffer(gl.ARRAY_BUFFER, starRenderer.colorBuffer);
+            gl.bufferData(gl.ARRAY_BUFFER, pointColors, gl.DYNAMIC_DRAW);
+        }
+
+        function drawStarsGL() {
+            const { program, vao, uniforms, maxPointSize } = starRenderer;
+            // Shrink the whole star, core included, so it keeps its proportions
+            // when the sprite would exceed the GPU's maximum point size
+            const shrink = Math.min(1, maxPointSize / (2 * Math.max(4, 8 * scale) * window.devicePixelRatio));
+            const size = Math.max(2, 3 * scale) * shrink;
+            const glowSize = Math.max(4, 8 * scale) * shrink;
+
+            gl.clearColor(0, 0, 0, 1);
+            gl.clear(gl.COLOR_BUFFER_BIT);
+            gl.enable(gl.BLEND);
+            gl.blendFunc(gl.SRC_ALPHA, gl.ONE_MINUS_SRC_ALPHA);
+
+            gl.useProgram(program);
+            gl.uniform2f(uniforms.uViewport, width, height);
+            gl.uniform2f(uniforms.uOffset, offsetX, offsetY);
+            gl.uniform1f(uniforms.uScale, scale);
+            gl.uniform1f(uniforms.uRadius, glowSize);
+            gl.uniform1f(uniforms.uPixelRatio, window.devicePixelRatio);
+            gl.uniform1f(uniforms.uCoreSize, size);
+            gl.uniform1f(uniforms.uTime, (Date.now() / 500) % (Math.PI * 2));
+            gl.uniform1i(uniforms.uPulse, scale > 1.5 ? 1 : 0);
+
+            gl.bindVertexArray(vao);
+            gl.drawArrays(gl.POINTS, 0, N);
+            gl.bindVertexArray(null);
+        }
+
+        // Canvas2D fallback: each color's glow + core is rasterized once into
+        // a slot of a shared sprite atlas, so a star costs one drawImage from
+        // the same source image instead of two arc/fill paths and a
+        // save/restore. Slots are padded by a pixel so scaled draws do not
+        // sample the neighbouring sprite.
+        const SPRITE_RADIUS = 32;
+        const SPRITE_CORE_RATIO = 3 / 8;
+        const SPRITE_SIZE = SPRITE_RADIUS * 2;
+        const ATLAS_PITCH = SPRITE_SIZE + 2;
+        const ATLAS_SLOTS_PER_ROW = 16;
+        const ATLAS_CAPACITY = ATLAS_SLOTS_PER_ROW * ATLAS_SLOTS_PER_ROW;
+
+        let spriteAtlas = null;
+        let atlasCtx = null;
+        const spriteSlots = new Map();
+
+        function getSpriteSlot(color) {
+            let slot = spriteSlots.get(color);
+            if (slot) {
+                return slot;
+            }
+
+            // Allocated on first use, so the WebGL path never pays for it
+            if (!spriteAtlas) {
+                spriteAtlas = document.createElement('canvas');
+                spriteAtlas.width = spriteAtlas.height = ATLAS_SLOTS_PER_ROW * ATLAS_PITCH;
+                atlasCtx = spriteAtlas.getContext('2d');
+            }
+
+            // One color mode never needs more slots than the atlas holds
+            // (goldstein has at most 256 shades), but start over if it fills up
+            if (spriteSlots.size === ATLAS_CAPACITY) {
+                atlasCtx.clearRect(0, 0, spriteAtlas.width, spriteAtlas.height);
+                spriteSlots.clear();
+            }
+
+            const index = spriteSlots.size;
+            slot = {
+                sx: (index % ATLAS_SLOTS_PER_ROW) * ATLAS_PITCH + 1,
+                sy: Math.floor(index / ATLAS_SLOTS_PER_ROW) * ATLAS_PITCH + 1
+            };
+            const cx = slot.sx + SPRITE_RADIUS;
+            const cy = slot.sy + SPRITE_RADIUS;
+
+            atlasCtx.fillStyle = color;
+
+            atlasCtx.globalAlpha = 0.3;
+            atlasCtx.beginPath();
+            atlasCtx.arc(cx, cy, SPRITE_RADIUS, 0, Math.PI * 2);
+            atlasCtx.fill();
+
+            atlasCtx.globalAlpha = 1;
+            atlasCtx.beginPath();
+            atlasCtx.arc(cx, cy, SPRITE_RADIUS * SPRITE_CORE_RATIO, 0, Math.PI * 2);
+            atlasCtx.fill();
+
+            spriteSlots.set(color, slot);
+            return slot;
+        }
+
+        // The pulse phase indexes a sine table instead of calling Math.sin
+        // per star; SIN_LUT_STEPS steps cover one period
+        const SIN_LUT_STEPS = 1024;
+        const SIN_LUT_SCALE = SIN_LUT_STEPS / (Math.PI * 2);
+        const sinLUT = new Float32Array(SIN_LUT_STEPS);
+        for (let i = 0; i < SIN_LUT_STEPS; i++) {
+            sinLUT[i] = Math.sin(i / SIN_LUT_SCALE);
+        }
+
+        function drawStar2D(i, sx, sy, glowSize, pulsePhase, pulseRings) {
+            if (sx < -10 || sx > width + 10 || sy < -10 || sy > height + 10) {
+                return;
+            }
+
+            const color = getPointColor(i);
+            const slot = getSpriteSlot(color);
+            ctx.drawImage(
+                spriteAtlas, slot.sx, slot.sy, SPRITE_SIZE, SPRITE_SIZE,
+                sx - glowSize, sy - glowSize, glowSize * 2, glowSize * 2
+            );
+
+            if (pulseRings) {
+                const size = glowSize * SPRITE_CORE_RATIO;
+                const phase = (pulsePhase + xy[2 * i] * 100 * SIN_LUT_SCALE) & (SIN_LUT_STEPS - 1);
+                const radius = (size + sinLUT[phase] * 0.5) * 2;
+
+                let rings = pulseRings.get(color);
+                if (!rings) {
+                    rings = new Path2D();
+                    pulseRings.set(color, rings);
+                }
+                rings.moveTo(sx + radius, sy);
+                rings.arc(sx, sy, radius, 0, Math.PI * 2);
+            }
+        }
+
+        // Screen positions of the stars the 2D renderer visits, reused across
+        // frames until the view changes (e.g. while only the pulse animates)
+        let screenX = null;
+        let screenY = null;
+        let screenViewKey = '';
+
+        function drawStars2D() {
+            if (!screenX) {
+                screenX = new Float32Array(N);
+                screenY = new Float32Array(N);
+            }
+            const viewKey = `${offsetX},${offsetY},${scale},${width},${height}`;
+            const viewChanged = viewKey !== screenViewKey;
+            screenViewKey = viewKey;
+
+            // Only visit grid cells that overlap the viewport (plus a margin)
+            const margin = 10;
+            const topLeft = screenToWorld(-margin, -margin);
+            const bottomRight = screenToWorld(width + margin, height + margin);
+            const range = gridCellRange(spatialGrid, topLeft.x, topLeft.y, bottomRight.x, bottomRight.y);
+            const glowSize = Math.max(4, 8 * scale);
+            const pulsePhase = Math.floor(Date.now() / 500 * SIN_LUT_SCALE) % SIN_LUT_STEPS;
+
+            // Pulse rings are collected into one Path2D per color and stroked
+            // after the stars, instead of a beginPath/arc/stroke per star
+            const pulseRings = scale > 1.5 ? new Map() : null;
+
+            for (let iy = range.iy0; iy <= range.iy1; iy++) {
+                for (let ix = range.ix0; ix <= range.ix1; ix++) {
+                    const cell = iy * spatialGrid.cols + ix;
+                    for (let k = spatialGrid.cellStart[cell]; k < spatialGrid.cellStart[cell + 1]; k++) {
+                        const i = spatialGrid.cellPoints[k];
+                        if (viewChanged) {
+                            screenX[i] = (xy[2 * i] * width + offsetX) * scale;
+                            screenY[i] = (xy[2 * i + 1] * height + offsetY) * scale;
+                        }
+                        drawStar2D(i, screenX[i], screenY[i], glowSize, pulsePhase, pulseRings);
+                    }
+                }
+            }
+
+            if (pulseRings) {
+                ctx.globalAlpha = 0.5;
+                ctx.lineWidth = 1;
+                pulseRings.forEach((rings, color) => {
+                    ctx.strokeStyle = color;
+                    ctx.stroke(rings);
+                });
+                ctx.globalAlpha = 1;
+            }
+        }
 
-            data.forEach(point => {{
-                const screen = worldToScreen(point.x, point.y);
+        function draw() {
+            ctx.clearRect(0, 0, width, height);
 
-                if (screen.x < -10 || screen.x > width + 10 ||
-                    screen.y < -10 || screen.y > height + 10) {{
-                    return;
-                }}
+            if (starRenderer) {
+                drawStarsGL();
+            } else {
+                drawStars2D();
+            }
 
-                const color = getPointColor(point);
-                const size = Math.max(2, 3 * scale);
-                const glowSize = Math.max(4, 8 * scale);
+            if (showWords && clusterCenters.length > 0) {
+                // Text and shadow state is the same for every label, so it is
+                // set once for the whole pass; only the fill color varies
+                const fontSize = Math.max(12, Math.min(24, 16 * scale));
 
                 ctx.save();
-                ctx.globalAlpha = 0.3;
-                ctx.fillStyle = color;
-                ctx.beginPath();
-                ctx.arc(screen.x, screen.y, glowSize, 0, Math.PI * 2);
-                ctx.fill();
-                ctx.restore();
-
-                ctx.fillStyle = color;
-                ctx.beginPath();
-                ctx.arc(screen.x, screen.y, size, 0, Math.PI * 2);
-                ctx.fill();
-
-                if (scale > 1.5) {{
-                    const pulseSize = size + Math.sin(Date.now() / 500 + point.x * 100) * 0.5;
-                    ctx.save();
-                    ctx.globalAlpha = 0.5;
-                    ctx.strokeStyle = color;
-                    ctx.lineWidth = 1;
-                    ctx.beginPath();
-                    ctx.arc(screen.x, screen.y, pulseSize * 2, 0, Math.PI * 2);
-                    ctx.stroke();
-                    ctx.restore();
-                }}
-            }});
-
-            if (showWords) {{
-                Object.keys(clusterCenters).forEach(clusterId => {{
-                    const cluster = clusterCenters[clusterId];
+                ctx.font = `${fontSize}px -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif`;
+                ctx.textAlign = 'center';
+                ctx.textBaseline = 'middle';
+                ctx.shadowColor = 'rgba(0, 0, 0, 0.8)';
+                ctx.shadowBlur = 8;
+                ctx.globalAlpha = 0.7;
+
+                clusterCenters.forEach(cluster => {
                     const screen = worldToScreen(cluster.x, cluster.y);
 
                     if (screen.x < -100 || screen.x > width + 100 ||
-                        screen.y < -100 || screen.y > height + 100) {{
+                        screen.y < -100 || screen.y > height + 100) {
                         return;
-                    }}
-
-                    const keywords = cluster.keywords.split(',').map(k => k.trim());
-                    const fontSize = Math.max(12, Math.min(24, 16 * scale));
-
-                    ctx.save();
-                    ctx.font = `${{fontSize}}px -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif`;
-                    ctx.textAlign = 'center';
-                    ctx.textBaseline = 'middle';
+                    }
 
-                    keywords.forEach((keyword, i) => {{
-                        if (keyword) {{
-                            const yOffset = (i - keywords.length / 2) * (fontSize + 4);
+                    ctx.fillStyle = cluster.color;
+                    cluster.labels.forEach((label, i) => {
+                        const yOffset = (i - cluster.labels.length / 2) * (fontSize + 4);
+                        ctx.fillText(label, screen.x, screen.y + yOffset);
+                    });
+                });
 
-                            ctx.shadowColor = 'rgba(0, 0, 0, 0.8)';
-                            ctx.shadowBlur = 8;
-                            ctx.fillStyle = cluster.color;
-                            ctx.globalAlpha = 0.7;
-
-                            ctx.fillText(keyword.toUpperCase(), screen.x, screen.y + yOffset);
-                        }}
-                    }});
-
-                    ctx.restore();
-                }});
-            }}
-        }}
-
-        function findPointAtPosition(mouseX, mouseY) {{
+                ctx.restore();
+            }
+
+            // The pulse ring is the only animation; keep frames coming only
+            // while it is visible
+            if (scale > 1.5) {
+                requestDraw();
+            }
+        }
+
+        // Redraws are event-driven: input handlers mark the frame dirty and
+        // at most one draw runs per animation frame
+        let drawPending = false;
+
+        function requestDraw() {
+            if (drawPending) {
+                return;
+            }
+            drawPending = true;
+            requestAnimationFrame(() => {
+                drawPending = false;
+                draw();
+            });
+        }
+
+        // Uniform grid over world coordinates, built once. Points are bucketed
+        // CSR-style: the indices of the points in cell c are
+        // cellPoints[cellStart[c]] .. cellPoints[cellStart[c + 1] - 1].
+        function buildSpatialGrid() {
+            let minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
+            for (let i = 0; i < N; i++) {
+                minX = Math.min(minX, xy[2 * i]);
+                maxX = Math.max(maxX, xy[2 * i]);
+                minY = Math.min(minY, xy[2 * i + 1]);
+                maxY = Math.max(maxY, xy[2 * i + 1]);
+            }
+            if (N === 0) {
+                minX = minY = 0;
+                maxX = maxY = 1;
+            }
+
+            const cols = Math.max(1, Math.min(1024, Math.ceil(Math.sqrt(N / 4))));
+            const rows = cols;
+            const grid = {
+                minX,
+                minY,
+                cols,
+                rows,
+                cellW: (maxX - minX) / cols || 1,
+                cellH: (maxY - minY) / rows || 1,
+                cellStart: new Int32Array(cols * rows + 1),
+                cellPoints: new Int32Array(N)
+            };
+
+            const cellOf = new Int32Array(N);
+            for (let i = 0; i < N; i++) {
+                const range = gridCellRange(grid, xy[2 * i], xy[2 * i + 1], xy[2 * i], xy[2 * i + 1]);
+                cellOf[i] = range.iy0 * cols + range.ix0;
+                grid.cellStart[cellOf[i] + 1]++;
+            }
+            for (let c = 0; c < cols * rows; c++) {
+                grid.cellStart[c + 1] += grid.cellStart[c];
+            }
+            const fill = grid.cellStart.slice(0, -1);
+            for (let i = 0; i < N; i++) {
+                grid.cellPoints[fill[cellOf[i]]++] = i;
+            }
+
+            return grid;
+        }
+
+        function gridCellRange(grid, x0, y0, x1, y1) {
+            const clampCol = v => Math.max(0, Math.min(grid.cols - 1, Math.floor(v)));
+            const clampRow = v => Math.max(0, Math.min(grid.rows - 1, Math.floor(v)));
+            return {
+                ix0: clampCol((x0 - grid.minX) / grid.cellW),
+                ix1: clampCol((x1 - grid.minX) / grid.cellW),
+                iy0: clampRow((y0 - grid.minY) / grid.cellH),
+                iy1: clampRow((y1 - grid.minY) / grid.cellH)
+            };
+        }
+
+        const spatialGrid = buildSpatialGrid();
+
+        function findPointAtPosition(mouseX, mouseY) {
             const threshold = 10;
-            let closest = null;
-            let closestDist = threshold;
-
-            data.forEach(point => {{
-                const screen = worldToScreen(point.x, point.y);
-                const dist = Math.sqrt(
-                    Math.pow(screen.x - mouseX, 2) +
-                    Math.pow(screen.y - mouseY, 2)
-                );
-
-                if (dist < closestDist) {{
-                    closestDist = dist;
-                    closest = point;
-                }}
-            }});
+            let closest = -1;
+            let closestDistSq = threshold * threshold;
+
+            // Only scan the cells within `threshold` screen pixels of the cursor
+            const world = screenToWorld(mouseX, mouseY);
+            const dx = threshold / (scale * width);
+            const dy = threshold / (scale * height);
+            const range = gridCellRange(spatialGrid, world.x - dx, world.y - dy, world.x + dx, world.y + dy);
+
+            for (let iy = range.iy0; iy <= range.iy1; iy++) {
+                for (let ix = range.ix0; ix <= range.ix1; ix++) {
+                    const cell = iy * spatialGrid.cols + ix;
+                    for (let k = spatialGrid.cellStart[cell]; k < spatialGrid.cellStart[cell + 1]; k++) {
+                        const i = spatialGrid.cellPoints[k];
+                        const sx = (xy[2 * i] * width + offsetX) * scale - mouseX;
+                        const sy = (xy[2 * i + 1] * height + offsetY) * scale - mouseY;
+                        const distSq = sx * sx + sy * sy;
+
+                        if (distSq < closestDistSq) {
+                            closestDistSq = distSq;
+                            closest = i;
+                        }
+                    }
+                }
+            }
 
             return closest;
-        }}
+        }
 
-        canvas.addEventListener('mousemove', (e) => {{
+        canvas.addEventListener('mousemove', (e) => {
             const rect = canvas.getBoundingClientRect();
             const mouseX = e.clientX - rect.left;
             const mouseY = e.clientY - rect.top;
 
-            if (isDragging) {{
+            if (isDragging) {
                 const dx = mouseX - lastMouseX;
                 const dy = mouseY - lastMouseY;
                 offsetX += dx / scale;
                 offsetY += dy / scale;
                 lastMouseX = mouseX;
                 lastMouseY = mouseY;
-                draw();
-            }} else {{
-                const point = findPointAtPosition(mouseX, mouseY);
+                requestDraw();
+            } else {
+                const i = stringsLoaded ? findPointAtPosition(mouseX, mouseY) : -1;
 
-                if (point) {{
-                    tooltip.querySelector('.title').textContent = point.title;
+                if (i >= 0) {
+                    tooltip.querySelector('.title').textContent = strings.title[i];
                     tooltip.querySelector('.meta').textContent =
-                        `Date: ${{point.date}} | Cluster: ${{point.cluster}} | Tone: ${{point.goldstein.toFixed(2)}}`;
+                        `Date: ${strings.date[i]} | Cluster: ${clusterIds[i]} | Tone: ${goldsteins[i].toFixed(2)}`;
                     tooltip.querySelector('.keywords').textContent =
-                        `Keywords: ${{point.keywords}}`;
+                        `Keywords: ${clusterKeywords[clusterIds[i]] || ''}`;
 
                     tooltip.style.left = (e.clientX + 15) + 'px';
                     tooltip.style.top = (e.clientY + 15) + 'px';
                     tooltip.classList.add('visible');
 
                     canvas.style.cursor = 'pointer';
-                }} else {{
+                } else {
                     tooltip.classList.remove('visible');
                     canvas.style.cursor = isDragging ? 'grabbing' : 'crosshair';
-                }}
-            }}
-        }});
+                }
+            }
+        });
 
-        canvas.addEventListener('mousedown', (e) => {{
+        canvas.addEventListener('mousedown', (e) => {
             isDragging = true;
             const rect = canvas.getBoundingClientRect();
             lastMouseX = e.clientX - rect.left;
             lastMouseY = e.clientY - rect.top;
             canvas.style.cursor = 'grabbing';
-        }});
+        });
 
-        canvas.addEventListener('mouseup', () => {{
+        canvas.addEventListener('mouseup', () => {
             isDragging = false;
             canvas.style.cursor = 'crosshair';
-        }});
+        });
 
-        canvas.addEventListener('mouseleave', () => {{
+        canvas.addEventListener('mouseleave', () => {
             isDragging = false;
             tooltip.classList.remove('visible');
             canvas.style.cursor = 'crosshair';
-        }});
+        });
 
-        canvas.addEventListener('wheel', (e) => {{
+        canvas.addEventListener('wheel', (e) => {
             e.preventDefault();
             const rect = canvas.getBoundingClientRect();
             const mouseX = e.clientX - rect.left;
@@ -673,50 +1357,43 @@ def generate_html(vis_data, metadata, output_file='docs/index.html'):
             offsetX += (world.x - newWorld.x) * width;
             offsetY += (world.y - newWorld.y) * height;
 
-            draw();
-        }});
+            requestDraw();
+        });
 
-        canvas.addEventListener('click', (e) => {{
+        canvas.addEventListener('click', (e) => {
             const rect = canvas.getBoundingClientRect();
             const mouseX = e.clientX - rect.left;
             const mouseY = e.clientY - rect.top;
-            const point = findPointAtPosition(mouseX, mouseY);
+            const i = findPointAtPosition(mouseX, mouseY);
 
-            if (point && point.url) {{
-                window.open(point.url, '_blank');
-            }}
-        }});
+            if (i >= 0 && strings.url[i]) {
+                window.open(strings.url[i], '_blank');
+            }
+        });
 
-        function updateLegend() {{
+        function updateLegend() {
             const legendContent = document.getElementById('legend-content');
             const legendTitle = document.getElementById('legend-title');
 
-            if (colorMode === 'cluster') {{
+            if (colorMode === 'cluster') {
                 legendTitle.textContent = 'Clusters';
-                const clusters = [...new Set(data.map(d => d.cluster))].sort((a, b) => a - b);
-                const clusterKeywords = {{}};
-
-                data.forEach(point => {{
-                    if (!clusterKeywords[point.cluster]) {{
-                        clusterKeywords[point.cluster] = point.keywords;
-                    }}
-                }});
+                const clusters = [...new Set(clusterIds)].sort((a, b) => a - b);
 
                 let html = '';
-                clusters.forEach(clusterId => {{
+                clusters.forEach(clusterId => {
                     const color = colors[clusterId % colors.length];
                     const keywords = clusterKeywords[clusterId] || 'N/A';
                     const shortKeywords = keywords.split(',').slice(0, 2).join(', ');
                     html += `
                         <div class="legend-item">
-                            <div class="legend-color" style="background-color: ${{color}}"></div>
-                            <div class="legend-label">Cluster ${{clusterId}}: ${{shortKeywords}}</div>
+                            <div class="legend-color" style="background-color: ${color}"></div>
+                            <div class="legend-label">Cluster ${clusterId}: ${shortKeywords}</div>
                         </div>
                     `;
-                }});
+                });
                 legendContent.innerHTML = html;
 
-            }} else if (colorMode === 'goldstein') {{
+            } else if (colorMode === 'goldstein') {
                 legendTitle.textContent = 'Goldstein Scale';
                 let html = `
                     <div class="legend-gradient" style="background: linear-gradient(to right, rgb(255, 0, 100), rgb(128, 128, 100), rgb(0, 255, 100))"></div>
@@ -731,67 +1408,133 @@ def generate_html(vis_data, metadata, output_file='docs/index.html'):
                 `;
                 legendContent.innerHTML = html;
 
-            }} else if (colorMode === 'event') {{
+            } else if (colorMode === 'event') {
                 legendTitle.textContent = 'Event Categories';
-                const categoriesInData = [...new Set(data.map(d => d.eventRootCode || '01'))].sort();
+                const categoriesInData = [...new Set(strings.eventRootCode.map(c => c || '01'))].sort();
 
                 let html = '';
-                categoriesInData.forEach(category => {{
+                categoriesInData.forEach(category => {
                     const color = eventCategoryColors[category] || '#999999';
-                    const name = eventCategoryNames[category] || `Category ${{category}}`;
+                    const name = eventCategoryNames[category] || `Category ${category}`;
                     html += `
                         <div class="legend-item">
-                            <div class="legend-color" style="background-color: ${{color}}"></div>
-                            <div class="legend-label">${{category}}: ${{name}}</div>
+                            <div class="legend-color" style="background-color: ${color}"></div>
+                            <div class="legend-label">${category}: ${name}</div>
                         </div>
                     `;
-                }});
+                });
                 legendContent.innerHTML = html;
-            }}
-        }}
+            }
+        }
 
-        function setColorMode(mode) {{
+        function setColorMode(mode) {
             colorMode = mode;
 
-            document.querySelectorAll('#controls button[id^="color"]').forEach(btn => {{
+            document.querySelectorAll('#controls button[id^="color"]').forEach(btn => {
                 btn.classList.remove('active');
-            }});
+            });
 
-            if (mode === 'cluster') {{
+            if (mode === 'cluster') {
                 document.getElementById('colorCluster').classList.add('active');
-            }} else if (mode === 'goldstein') {{
+            } else if (mode === 'goldstein') {
                 document.getElementById('colorGoldstein').classList.add('active');
-            }} else if (mode === 'event') {{
+            } else if (mode === 'event') {
                 document.getElementById('colorEvent').classList.add('active');
-            }}
+            }
 
+            updateStarColors();
             updateLegend();
-            draw();
-        }}
-
-        function initStats() {{
-            const clusters = [...new Set(data.map(d => d.cluster))].sort((a, b) => a - b);
-            document.getElementById('total-events').textContent = data.length;
-            document.getElementById('total-clusters').textContent = clusters.length;
-        }}
+            requestDraw();
+        }
 
-        function animate() {{
-            draw();
-            requestAnimationFrame(animate);
-        }}
+        function initStats() {
+            const clusters = new Set(clusterIds);
+            document.getElementById('total-events').textContent = N;
+            document.getElementById('total-clusters').textContent = clusters.size;
+        }
 
         initStats();
+        updateStarColors();
         updateLegend();
-        animate();
+        requestDraw();
+
+        inflateJSON("__STRINGS_DATA__").then(columns => {
+            Object.assign(strings, columns);
+            stringsLoaded = true;
+            delete colorIndexCache.event;
+            updateStarColors();
+            updateLegend();
+            requestDraw();
+        }).catch(err => {
+            // Stars stay usable; only tooltips and event-code colours are lost
+            console.error('Could not load event details:', err);
+        });
     </script>
 </body>
 </html>
-"""
+""")
+
+
+def generate_html(vis_data, metadata, output_file='docs/index.html'):
+    """Generate modern interactive HTML visualization."""
+    output_path = Path(__file__).parent.parent / output_file
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    country_name = metadata.get('country', 'Unknown')
+    top_words = metadata.get('top_words', [])
+
+    cluster_colors = [
+        '#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8',
+        '#F7DC6F', '#BB8FCE', '#85C1E2', '#F8B88B', '#ABEBC6'
+    ]
+
+    cluster_centers_json = _script_json(metadata.get('cluster_centers', []))
+
+    # Positions only need screen precision: 16 bits over the bounding box
+    # stays under a pixel even at maximum zoom, at half the bytes of float32
+    xy_quantized, xy_low, xy_span = _quantize_positions(vis_data['x'], vis_data['y'])
+
+    # The per-point payloads are streamed into the file at these slots rather
+    # than interpolated, so the page is never held in memory as one string.
+    # Numeric columns travel as base64-encoded little-endian typed arrays,
+    # strings as one deflated, base64-encoded JSON object of parallel arrays.
+    string_fields = ['title', 'date', 'url', 'eventCode', 'eventRootCode']
+    data_slots = {
+        '__XY_DATA__': lambda f: _write_base64(f, xy_quantized, '<u2'),
+        '__CLUSTER_DATA__': lambda f: _write_base64(f, vis_data['cluster'], '<i4'),
+        '__GOLDSTEIN_DATA__': lambda f: _write_base64(f, vis_data['goldstein'], '<f4'),
+        '__STRINGS_DATA__': lambda f: _write_deflated_json(f, {field: vis_data[field] for field in string_fields}),
+    }
+
+    html_template = PAGE_TEMPLATE.substitute(
+        country_name=country_name,
+        top_words=' · '.join(top_words),
+        xy_low=_script_json(xy_low),
+        xy_span=_script_json(xy_span),
+        empty_strings=_script_json({field: [] for field in string_fields}),
+        cluster_colors=_script_json(cluster_colors),
+        cluster_centers=cluster_centers_json
+    )
+
+    # Payloads are written as bytes (base64 and orjson output already are),
+    # so only the shell text between the slots is ever encoded
+    with open(output_path, 'wb') as f:
+        for part in re.split(r'(__[A-Z]+_DATA__)', html_template):
+            if part in data_slots:
+                data_slots[part](f)
+            else:
+                f.write(part.encode('utf-8'))
 
-    output_path.write_text(html_content)
+    # Pre-compressed copy for static servers that serve .gz siblings
+    # (e.g. nginx gzip_static); mtime=0 keeps the output reproducible
+    gzip_path = output_path.with_name(output_path.name + '.gz')
+    with open(output_path, 'rb') as src, gzip.GzipFile(gzip_path, 'wb', compresslevel=9, mtime=0) as dst:
+        shutil.copyfileobj(src, dst)
 
     logger.info(f"Visualization saved to: {output_path.absolute()}")
     logger.info(f"File size: {output_path.stat().st_size / 1024:.1f} KB")
+    logger.info(f"Compressed copy saved to: {gzip_path.absolute()}")
+    logger.info(f"File size: {gzip_path.stat().st_size / 1024:.1f} KB")
 
     return output_path
 
@@ -815,7 +1558,7 @@ def main():
     print(f"Country: {metadata['country']}")
     print(f"Top words: {', '.join(metadata['top_words'])}")
     print(f"Visualization saved to: {output_file}")
-    print(f"Total events: {len(vis_data)}")
+    print(f"Total events: {len(vis_data['x'])}")
     print("=" * 60)
     print()
     print("Open the HTML file in your browser to explore the visualization!")